@@ -4,7 +4,7 @@ from fractions import Fraction
 
 from tqdm import tqdm
 
-from smartcut.media_container import MediaContainer
+from smartcut.media_container import MediaContainer, pts_to_time
 from smartcut.media_utils import VideoExportMode, VideoExportQuality
 from smartcut.misc_data import AudioExportInfo, AudioExportSettings
 from smartcut.smart_cut import __version__, smart_cut
@@ -89,7 +89,8 @@ def frame_to_time(source: MediaContainer, frame_str: str, end_frame: bool = Fals
         # Internal calculations in `smart_cut` function currently *exclude* the final frame if it lands
         # exactly on the specified end time, so we manually offset "end" frames by 1
         frame_num += 1
-    return source.video_frame_times[frame_num] - source.start_time
+    assert source.video_stream is not None and source.video_stream.time_base is not None
+    return pts_to_time(source.video_frame_times_pts[frame_num], source.video_stream.time_base) - source.start_time
 
 def parse_frame_segments(source: MediaContainer, frame_str: str) -> list[tuple[Fraction, Fraction]]:
     all_frames = frame_str.split(',')
@@ -23,22 +23,50 @@ def ts_to_time(ts: float) -> Fraction:
     return Fraction(round(ts*1000), 1000)
 
 
-def _multiply_array_by_fraction(args: tuple[np.ndarray, Fraction]) -> np.ndarray:
-    """Helper for parallel Fraction array multiplication (must be at module level for pickling)."""
-    arr, time_base = args
-    return arr * time_base
+def pts_to_time(pts: int | np.integer, time_base: Fraction) -> Fraction:
+    """Exact time in seconds of a PTS value. Use this instead of the (lossy) float64 frame time arrays."""
+    return Fraction(int(pts)) * time_base
 
 
-@dataclass
+# Stand-in for a missing packet DTS in the per-GOP tables. Sorts before every real DTS.
+DTS_UNKNOWN = int(np.iinfo(np.int64).min)
+
+# Upper bound for list pre-sizing (8 MB of pointers per stream), so a bogus duration or frame
+# rate in a broken header can't allocate huge lists before any packet is read. Longer streams
+# grow past it with append()
+_MAX_PRESIZED_PACKETS = 1_000_000
+
+
+def _estimate_packet_count(stream: Stream, duration: Fraction) -> int:
+    """Best-effort packet count for pre-sizing demux lists. Returns 0 when unknown."""
+    if stream.frames:
+        estimate = stream.frames
+    elif isinstance(stream, VideoStream) and stream.average_rate:
+        estimate = int(duration * stream.average_rate)
+    elif isinstance(stream, AudioStream) and stream.sample_rate and stream.codec_context.frame_size:
+        estimate = int(duration * stream.sample_rate / stream.codec_context.frame_size)
+    else:
+        estimate = 0
+    return min(estimate, _MAX_PRESIZED_PACKETS)
+
+
+def _pts_array_to_seconds(pts: np.ndarray, time_base: Fraction) -> np.ndarray:
+    """Convert an integer PTS array to float64 seconds without going through object-dtype Fractions."""
+    return pts * time_base.numerator / time_base.denominator
+
+
+@dataclass(slots=True)
 class AudioTrack:
     media_container: "MediaContainer"
     av_stream: AudioStream
     path: str
     index: int
 
-    packets: list[Packet] = field(default_factory = lambda: [])
+    # Only packet PTS values are kept (in demux order), not the packets themselves,
+    # so the compressed audio isn't held in RAM. Cutters re-read the packets from path.
     frame_times_pts: np.ndarray = field(default_factory = lambda: np.empty(()))
-    frame_times: np.ndarray = field(default_factory = lambda: np.empty(()))
+    frame_times: np.ndarray = field(default_factory = lambda: np.empty(())) # float64 seconds
+    last_packet: Packet | None = None
 
 class MediaContainer:
     av_container: InputContainer
@@ -46,18 +74,21 @@ class MediaContainer:
     path: str
 
     video_frame_times_pts: np.ndarray
-    video_frame_times: np.ndarray
-    video_keyframe_indices: list[int]
-    gop_start_times_pts_s: list[int] # Smallest pts in a GOP, in seconds
-
-    gop_start_times_dts: list[int]
-    gop_end_times_dts: list[int]
+    video_frame_times: np.ndarray # float64 seconds, use pts_to_time for exact values
+    video_keyframe_indices: np.ndarray # Index into video_frame_times_pts of each GOP start (intp)
+    gop_start_times_pts: np.ndarray # Smallest pts in a GOP (int64), for vectorized lookups
+    gop_start_times_pts_s: list[Fraction] # Smallest pts in a GOP, in seconds
+
+    # Per-GOP tables are parallel int64 arrays, so cut planning walks contiguous memory
+    gop_start_times_dts: np.ndarray
+    gop_end_times_dts: np.ndarray
     gop_start_nal_types: list[int | None]  # NAL type of first picture frame after each GOP boundary
     gop_leading_end_dts: list[int | None]  # DTS of first non-leading picture in GOP (None if no leading pics)
     gop_has_rasl: list[bool]  # True if GOP has RASL frames (need priming/hybrid recode)
 
     audio_tracks: list[AudioTrack]
     subtitle_tracks: list
+    attachment_streams: list[Stream]  # Copied as-is to outputs that support attachments
 
     duration: Fraction
     start_time: Fraction
@@ -65,49 +96,61 @@ class MediaContainer:
     def __init__(self, path: str) -> None:
         self.path = path
 
-        frame_pts = []
-        self.video_keyframe_indices = []
-
         self.av_container = av_container = av_open(path, 'r', metadata_errors='ignore')
 
         self.chat_url = None
         self.chat_history = None
         self.chat_visualize = True
         self.start_time = Fraction(av_container.start_time, AV_TIME_BASE) if av_container.start_time is not None else Fraction(0)
+        self._start_time_f = float(self.start_time)  # For the float64 lookup paths, avoids per-call Fraction math
         manual_duration_calc = av_container.duration is None
         self.duration = Fraction(av_container.duration , AV_TIME_BASE) if av_container.duration is not None else Fraction(0)
 
         is_h264 = False
         is_h265 = False
 
-        streams: list[Stream]
+        # Each streams.<type> access builds a new tuple in PyAV, so read them once
+        video_streams = av_container.streams.video
+        audio_streams = av_container.streams.audio
+        subtitle_streams = av_container.streams.subtitles
+        self.attachment_streams = list(av_container.streams.attachments)
 
-        if len(av_container.streams.video) == 0:
+        streams: list[Stream] = []
+
+        if len(video_streams) == 0:
             self.video_stream = None
-            streams = [*av_container.streams.audio]
         else:
-            self.video_stream = av_container.streams.video[0]
+            self.video_stream = video_streams[0]
             self.video_stream.thread_type = "FRAME"
-            streams = [self.video_stream, *av_container.streams.audio]
+            streams.append(self.video_stream)
+
+            codec_name = self.video_stream.codec_context.name
+            is_h265 = codec_name == 'hevc'
+            is_h264 = codec_name == 'h264'
 
-            if self.video_stream.codec_context.name == 'hevc':
-                is_h265 = True
-            if self.video_stream.codec_context.name == 'h264':
-                is_h264 = True
+        # Pre-size the per-packet lists from the frame count estimate so long files don't pay for
+        # repeated list growth. Writes past the estimate fall back to append().
+        frame_pts: list[int] = [0] * (_estimate_packet_count(self.video_stream, self.duration) if self.video_stream is not None else 0)
+        frame_count = 0
 
         self.audio_tracks = []
         stream_index_to_audio_track = {}
-        for i, audio_stream in enumerate(av_container.streams.audio):
+        audio_pts_by_stream: dict[int, list[int]] = {}
+        audio_packet_counts: dict[int, int] = {}
+        streams.extend(audio_streams)
+        for i, audio_stream in enumerate(audio_streams):
             if audio_stream.time_base is None:
                 continue
             audio_stream.codec_context.thread_type = "FRAME"
             track = AudioTrack(self, audio_stream, path, i)
+            audio_pts_by_stream[audio_stream.index] = [0] * _estimate_packet_count(audio_stream, self.duration)
+            audio_packet_counts[audio_stream.index] = 0
             self.audio_tracks.append(track)
             stream_index_to_audio_track[audio_stream.index] = track
 
         self.subtitle_tracks = []
         stream_index_to_subtitle_track = {}
-        for i, s in enumerate(av_container.streams.subtitles):
+        for i, s in enumerate(subtitle_streams):
             streams.append(s)
             stream_index_to_subtitle_track[s.index] = i
             self.subtitle_tracks.append([])
@@ -118,8 +161,10 @@ class MediaContainer:
         # Converting to Fraction once at end is much faster than per-packet Fraction math
         max_end_pts_by_stream: dict[int, int] = {}
 
-        self.gop_start_times_dts = []
-        self.gop_end_times_dts = []
+        # Per-GOP values are collected in lists during demux and packed into arrays afterwards
+        keyframe_indices: list[int] = []
+        gop_start_dts: list[int] = []
+        gop_end_dts: list[int] = []
         self.gop_start_nal_types = []
         self.gop_leading_end_dts = []
         self.gop_has_rasl = []
@@ -129,23 +174,32 @@ class MediaContainer:
         current_gop_has_leading = False
         current_gop_has_rasl = False
 
+        # Dispatch on stream index: packet.stream.type goes through a stream object and a string compare
+        video_stream_index = self.video_stream.index if self.video_stream is not None else -1
+
         for packet in av_container.demux(streams):
-            if packet.pts is None:
+            # Every packet attribute is a PyAV property call, read each of them once
+            pts = packet.pts
+            if pts is None:
                 continue
+            dts = packet.dts
+            stream_idx = packet.stream_index
 
-            if manual_duration_calc and (packet.pts is not None and packet.duration is not None):
-                stream_idx = packet.stream_index
-                end_pts = packet.pts + packet.duration
-                if stream_idx not in max_end_pts_by_stream or end_pts > max_end_pts_by_stream[stream_idx]:
-                    max_end_pts_by_stream[stream_idx] = end_pts
-            if packet.stream.type == 'video' and self.video_stream:
+            if manual_duration_calc:
+                packet_duration = packet.duration
+                if packet_duration is not None:
+                    end_pts = pts + packet_duration
+                    if stream_idx not in max_end_pts_by_stream or end_pts > max_end_pts_by_stream[stream_idx]:
+                        max_end_pts_by_stream[stream_idx] = end_pts
+            if stream_idx == video_stream_index:
 
                 if packet.is_keyframe:
+                    # memoryview avoids copying the (potentially large) keyframe payload
                     nal_type = None
                     if is_h265:
-                        nal_type = get_h265_nal_unit_type(bytes(packet))
+                        nal_type = get_h265_nal_unit_type(memoryview(packet))
                     elif is_h264:
-                        nal_type = get_h264_nal_unit_type(bytes(packet))
+                        nal_type = get_h264_nal_unit_type(memoryview(packet))
 
                     # Always allow the first keyframe regardless of NAL type (may be SEI, parameter sets, etc.)
                     is_safe_keyframe = True
@@ -164,13 +218,12 @@ class MediaContainer:
                             self.gop_leading_end_dts.append(None if not current_gop_has_leading else last_seen_video_dts)
                             self.gop_has_rasl.append(current_gop_has_rasl)
 
-                        self.video_keyframe_indices.append(len(frame_pts))
-                        dts = packet.dts if packet.dts is not None else -100_000_000
-                        self.gop_start_times_dts.append(dts)
+                        keyframe_indices.append(frame_count)
+                        gop_start_dts.append(dts if dts is not None else DTS_UNKNOWN)
                         self.gop_start_nal_types.append(nal_type)
 
                         if last_seen_video_dts is not None:
-                            self.gop_end_times_dts.append(last_seen_video_dts)
+                            gop_end_dts.append(last_seen_video_dts)
 
                         # Start tracking leading pictures if this is a CRA GOP
                         if is_h265 and nal_type == 21:  # CRA frame
@@ -187,7 +240,7 @@ class MediaContainer:
 
                 elif tracking_leading_in_cra and is_h265:
                     # Check if this non-keyframe packet is a leading picture
-                    packet_nal_type = get_h265_nal_unit_type(bytes(packet))
+                    packet_nal_type = get_h265_nal_unit_type(memoryview(packet))
                     if is_leading_picture_nal_type(packet_nal_type):
                         current_gop_has_leading = True
                         if is_rasl_nal_type(packet_nal_type):
@@ -196,8 +249,7 @@ class MediaContainer:
                         # Found first non-leading picture
                         if current_gop_has_leading:
                             # Record boundary only if there were actual leading pictures
-                            dts = packet.dts if packet.dts is not None else -100_000_000
-                            self.gop_leading_end_dts.append(dts)
+                            self.gop_leading_end_dts.append(dts if dts is not None else DTS_UNKNOWN)
                         else:
                             # No leading pictures in this CRA GOP
                             self.gop_leading_end_dts.append(None)
@@ -205,16 +257,27 @@ class MediaContainer:
                         tracking_leading_in_cra = False
 
                 # Use PTS as fallback when DTS is None (common in exported segments)
-                last_seen_video_dts = packet.dts if packet.dts is not None else packet.pts
-                frame_pts.append(packet.pts)
-            elif packet.stream.type == 'audio':
-                track = stream_index_to_audio_track[packet.stream_index]
+                last_seen_video_dts = dts if dts is not None else pts
+                if frame_count < len(frame_pts):
+                    frame_pts[frame_count] = pts
+                else:
+                    frame_pts.append(pts)
+                frame_count += 1
+                continue
+
+            track = stream_index_to_audio_track.get(stream_idx)
+            if track is not None:
                 track.last_packet = packet
 
-                # NOTE: storing the audio packets like this keeps the whole compressed audio loaded in RAM
-                track.packets.append(packet)
-            elif packet.stream.type == 'subtitle':
-                self.subtitle_tracks[stream_index_to_subtitle_track[packet.stream_index]].append(packet)
+                audio_pts = audio_pts_by_stream[stream_idx]
+                packet_count = audio_packet_counts[stream_idx]
+                if packet_count < len(audio_pts):
+                    audio_pts[packet_count] = pts
+                else:
+                    audio_pts.append(pts)
+                audio_packet_counts[stream_idx] = packet_count + 1
+            elif stream_idx in stream_index_to_subtitle_track:
+                self.subtitle_tracks[stream_index_to_subtitle_track[stream_idx]].append(packet)
 
         # Finalize manual duration calculation - convert from PTS to Fraction once
         if manual_duration_calc and max_end_pts_by_stream:
@@ -236,64 +299,91 @@ class MediaContainer:
             # shortest length. When all packets have dts=None (can happen in short
             # exported segments), last_seen_video_dts stays None, so we use the
             # same sentinel value used for gop_start_times_dts when DTS is missing.
-            if len(self.gop_end_times_dts) < len(self.gop_start_times_dts):
-                fallback_dts = last_seen_video_dts if last_seen_video_dts is not None else -100_000_000
-                self.gop_end_times_dts.append(fallback_dts)
-            assert len(self.gop_start_times_dts) == len(self.gop_end_times_dts), \
-                f"GOP DTS array length mismatch: start={len(self.gop_start_times_dts)}, end={len(self.gop_end_times_dts)}"
-            frame_pts_sorted = np.sort(np.array(frame_pts))
+            if len(gop_end_dts) < len(gop_start_dts):
+                fallback_dts = last_seen_video_dts if last_seen_video_dts is not None else DTS_UNKNOWN
+                gop_end_dts.append(fallback_dts)
+            assert len(gop_start_dts) == len(gop_end_dts), \
+                f"GOP DTS array length mismatch: start={len(gop_start_dts)}, end={len(gop_end_dts)}"
+            # fromiter with count reads just the filled part of the pre-sized list, no slice copy or dtype probing
+            frame_pts_sorted = np.fromiter(frame_pts, dtype=np.int64, count=frame_count)
+            frame_pts_sorted.sort()
             self.video_frame_times_pts = frame_pts_sorted
+            self.video_keyframe_indices = np.array(keyframe_indices, dtype=np.intp)
+            self.gop_start_times_pts = frame_pts_sorted[self.video_keyframe_indices]
+        else:
+            self.video_keyframe_indices = np.empty(0, dtype=np.intp)
+            self.gop_start_times_pts = np.empty(0, dtype=np.int64)
+        self.gop_start_times_dts = np.array(gop_start_dts, dtype=np.int64)
+        self.gop_end_times_dts = np.array(gop_end_dts, dtype=np.int64)
 
         # Collect PTS arrays for audio tracks
         for t in self.audio_tracks:
-            frame_pts_array = np.array(list(map(lambda p: p.pts, t.packets)))
-            t.frame_times_pts = frame_pts_array
+            stream_idx = t.av_stream.index
+            t.frame_times_pts = np.fromiter(audio_pts_by_stream[stream_idx], dtype=np.int64, count=audio_packet_counts[stream_idx])
 
-        # Parallelize Fraction array multiplication (expensive due to per-element Fraction creation)
-        from concurrent.futures import ThreadPoolExecutor
-        tasks: list[tuple[np.ndarray, Fraction]] = []
+        # Frame times are stored as float64 seconds. Exact Fraction times are derived
+        # from the integer PTS arrays only where they are needed (see pts_to_time).
         if self.video_stream is not None and self.video_stream.time_base is not None:
-            tasks.append((self.video_frame_times_pts, self.video_stream.time_base))
+            self.video_frame_times = _pts_array_to_seconds(self.video_frame_times_pts, self.video_stream.time_base)
+            self.gop_start_times_pts_s = [pts_to_time(pts, self.video_stream.time_base) for pts in self.gop_start_times_pts]
         for t in self.audio_tracks:
             if t.av_stream.time_base is not None:
-                tasks.append((t.frame_times_pts, t.av_stream.time_base))
-
-        if tasks:
-            with ThreadPoolExecutor() as executor:
-                results = list(executor.map(_multiply_array_by_fraction, tasks))
-
-            result_idx = 0
-            if self.video_stream is not None and self.video_stream.time_base is not None:
-                self.video_frame_times = results[result_idx]
-                self.gop_start_times_pts_s = list(self.video_frame_times[self.video_keyframe_indices])
-                result_idx += 1
-            for t in self.audio_tracks:
-                if t.av_stream.time_base is not None:
-                    t.frame_times = results[result_idx]
-                    result_idx += 1
+                t.frame_times = _pts_array_to_seconds(t.frame_times_pts, t.av_stream.time_base)
 
     def close(self) -> None:
         self.av_container.close()
 
     def get_next_frame_time(self, t: Fraction) -> Fraction:
         assert self.video_stream is not None
+        time_base = cast(Fraction, self.video_stream.time_base)
         t += self.start_time
         # Convert to PTS for searching
-        t_pts = round(t / cast(Fraction, self.video_stream.time_base))
+        t_pts = round(t / time_base)
         idx = np.searchsorted(self.video_frame_times_pts, t_pts)
         if idx == len(self.video_frame_times_pts):
             return self.duration
         elif idx == 0:
-            return self.video_frame_times[0] - self.start_time
+            return pts_to_time(self.video_frame_times_pts[0], time_base) - self.start_time
         # Otherwise, find the closest of the two possible candidates: arr[idx-1] and arr[idx]
         else:
-            prev_val = self.video_frame_times[idx - 1]
-            next_val = self.video_frame_times[idx]
+            prev_val = pts_to_time(self.video_frame_times_pts[idx - 1], time_base)
+            next_val = pts_to_time(self.video_frame_times_pts[idx], time_base)
             if t - prev_val <= next_val - t:
                 return prev_val - self.start_time
             else:
                 return next_val - self.start_time
 
+    def get_next_frame_times(self, ts: np.ndarray) -> np.ndarray:
+        """Batched version of get_next_frame_time.
+
+        Snaps every time in ts to the nearest video frame with a single searchsorted
+        call, which is much cheaper than calling get_next_frame_time in a loop.
+
+        Args:
+            ts: Times in seconds (relative to start_time=0)
+
+        Returns:
+            float64 array of frame times (relative to start_time=0), duration for times past the last frame.
+        """
+        assert self.video_stream is not None
+        frame_times = self.video_frame_times
+        start_time = self._start_time_f
+        shifted = np.asarray(ts, dtype=np.float64) + start_time
+        n = len(frame_times)
+        if n == 0:
+            return np.full(shifted.shape, float(self.duration))
+
+        t_pts = np.round(shifted / float(cast(Fraction, self.video_stream.time_base)))
+        idx = np.searchsorted(self.video_frame_times_pts, t_pts)
+        # Clip so both neighbours are valid indices, boundaries are patched below
+        clipped = np.clip(idx, 1, max(n - 1, 1))
+        prev_val = frame_times[clipped - 1]
+        next_val = frame_times[np.minimum(clipped, n - 1)]
+        result = np.where(shifted - prev_val <= next_val - shifted, prev_val, next_val) - start_time
+        result[idx == 0] = frame_times[0] - start_time
+        result[idx == n] = float(self.duration)
+        return result
+
     def get_frame_time_at_or_before(self, t: Fraction) -> Fraction:
         """Get frame time at or before the given time (snap down).
 
@@ -309,12 +399,10 @@ class MediaContainer:
         t_absolute = t + self.start_time
 
         if self.video_stream is not None:
-            frame_times = self.video_frame_times
             frame_times_pts = self.video_frame_times_pts
             time_base = cast(Fraction, self.video_stream.time_base)
         elif self.audio_tracks:
             track = self.audio_tracks[0]
-            frame_times = track.frame_times
             frame_times_pts = track.frame_times_pts
             time_base = cast(Fraction, track.av_stream.time_base)
         else:
@@ -324,7 +412,7 @@ class MediaContainer:
         # side='right' ensures we get index after t if t is exactly on a frame boundary
         idx = int(np.searchsorted(frame_times_pts, t_pts, side='right')) - 1
         idx = max(0, idx)
-        return frame_times[idx] - self.start_time
+        return pts_to_time(frame_times_pts[idx], time_base) - self.start_time
 
     def get_frame_time_at_or_after(self, t: Fraction) -> Fraction:
         """Get frame time at or after the given time (snap up).
@@ -341,12 +429,10 @@ class MediaContainer:
         t_absolute = t + self.start_time
 
         if self.video_stream is not None:
-            frame_times = self.video_frame_times
             frame_times_pts = self.video_frame_times_pts
             time_base = cast(Fraction, self.video_stream.time_base)
         elif self.audio_tracks:
             track = self.audio_tracks[0]
-            frame_times = track.frame_times
             frame_times_pts = track.frame_times_pts
             time_base = cast(Fraction, track.av_stream.time_base)
         else:
@@ -355,6 +441,6 @@ class MediaContainer:
         t_pts = round(t_absolute / time_base)
         # side='left' ensures we get index of frame at or after t
         idx = int(np.searchsorted(frame_times_pts, t_pts, side='left'))
-        if idx >= len(frame_times):
+        if idx >= len(frame_times_pts):
             return self.duration
-        return frame_times[idx] - self.start_time
+        return pts_to_time(frame_times_pts[idx], time_base) - self.start_time
@@ -5,6 +5,7 @@ and low-level media knowledge. All media format details should be centralized he
 """
 
 from enum import Enum
+from functools import lru_cache
 
 
 class VideoExportMode(Enum):
@@ -52,6 +53,92 @@ class AudioChannels(Enum):
     SURROUND_5_1 = "5.1"
 
 
+# --- Lookup tables, built once at import ---
+# Codec lists are tuples so the shared tables can't be mutated through a returned value.
+
+_CRF_BY_QUALITY: dict[VideoExportQuality, int] = {
+    VideoExportQuality.LOW: 23,
+    VideoExportQuality.NORMAL: 18,
+    VideoExportQuality.HIGH: 14,
+    VideoExportQuality.INDISTINGUISHABLE: 8,
+    VideoExportQuality.NEAR_LOSSLESS: 3,
+    VideoExportQuality.LOSSLESS: 0
+}
+
+# Map extensions to required codecs for compatibility
+_REQUIRED_AUDIO_CODEC_BY_EXTENSION: dict[str, str] = {
+    'mp3': AudioCodec.MP3.value,
+    'flac': AudioCodec.FLAC.value,
+    'ogg': AudioCodec.LIBOPUS.value,
+    'wav': AudioCodec.PCM_S16LE.value,
+    'm4a': AudioCodec.AAC.value,
+    'ipod': AudioCodec.AAC.value,  # iPod format (alternative M4A name)
+}
+
+_AUDIO_ONLY_FORMATS: tuple[str, ...] = ('mp3', 'flac', 'ogg', 'wav', 'm4a', 'ipod')
+_AUDIO_ONLY_FORMATS_SET = frozenset(_AUDIO_ONLY_FORMATS)
+
+_SINGLE_AUDIO_TRACK_FORMATS = frozenset(('ogg', 'mp3', 'm4a', 'flac', 'wav'))
+
+# Audio-only containers have strict requirements
+_AUDIO_ONLY_CONTAINER_AUDIO_CODECS: dict[str, tuple[AudioCodec, ...]] = {
+    'mp3': (AudioCodec.MP3,),
+    'flac': (AudioCodec.FLAC,),
+    'wav': (AudioCodec.PCM_S16LE, AudioCodec.PCM_F32LE),
+    'ogg': (AudioCodec.LIBOPUS, AudioCodec.LIBVORBIS),
+    'm4a': (AudioCodec.AAC,),
+    'ipod': (AudioCodec.AAC,),
+}
+
+_VIDEO_CONTAINER_AUDIO_CODECS: dict[str, tuple[AudioCodec, ...]] = {
+    'mp4': (AudioCodec.AAC, AudioCodec.MP3),
+    'mov': (AudioCodec.AAC, AudioCodec.MP3),
+    'mkv': (AudioCodec.AAC, AudioCodec.MP3, AudioCodec.LIBOPUS, AudioCodec.FLAC, AudioCodec.PCM_S16LE),
+    'webm': (AudioCodec.LIBOPUS, AudioCodec.LIBVORBIS),
+    'avi': (AudioCodec.MP3, AudioCodec.PCM_S16LE),
+}
+_DEFAULT_AUDIO_CODECS: tuple[AudioCodec, ...] = (AudioCodec.AAC, AudioCodec.MP3)
+
+_CONTAINER_VIDEO_CODECS: dict[str, tuple[VideoCodec, ...]] = {
+    'mp4': (VideoCodec.H264, VideoCodec.HEVC, VideoCodec.AV1),
+    'mov': (VideoCodec.H264, VideoCodec.HEVC),
+    'mkv': (VideoCodec.H264, VideoCodec.HEVC, VideoCodec.VP9, VideoCodec.AV1),
+    'webm': (VideoCodec.VP9, VideoCodec.AV1),
+    'avi': (VideoCodec.H264,),
+}
+_DEFAULT_VIDEO_CODECS: tuple[VideoCodec, ...] = (VideoCodec.H264, VideoCodec.HEVC)
+
+_DEFAULT_AUDIO_CODEC_BY_CONTAINER: dict[str, AudioCodec] = {
+    # Audio-only containers have specific defaults
+    'mp3': AudioCodec.MP3,
+    'flac': AudioCodec.FLAC,
+    'wav': AudioCodec.PCM_S16LE,
+    'ogg': AudioCodec.LIBOPUS,
+    'm4a': AudioCodec.AAC,
+    'ipod': AudioCodec.AAC,
+    # Video container defaults
+    'mp4': AudioCodec.AAC,
+    'mov': AudioCodec.AAC,
+    'mkv': AudioCodec.AAC,
+    'webm': AudioCodec.LIBOPUS,
+    'avi': AudioCodec.MP3,
+}
+
+_DEFAULT_VIDEO_CODEC_BY_CONTAINER: dict[str, VideoCodec] = {
+    'mp4': VideoCodec.H264,
+    'mov': VideoCodec.H264,
+    'mkv': VideoCodec.H264,
+    'webm': VideoCodec.VP9,
+    'avi': VideoCodec.H264,
+}
+
+
+@lru_cache(maxsize=32)
+def _normalize_extension(ext: str) -> str:
+    """Lowercase a file extension and strip the leading dot."""
+    return ext.lower().lstrip('.')
+
+
 def get_crf_for_quality(quality: VideoExportQuality) -> int:
     """Get CRF value for the selected quality preset.
 
@@ -61,15 +148,7 @@ def get_crf_for_quality(quality: VideoExportQuality) -> int:
     Returns:
         CRF value (lower = higher quality)
     """
-    crf_map = {
-        VideoExportQuality.LOW: 23,
-        VideoExportQuality.NORMAL: 18,
-        VideoExportQuality.HIGH: 14,
-        VideoExportQuality.INDISTINGUISHABLE: 8,
-        VideoExportQuality.NEAR_LOSSLESS: 3,
-        VideoExportQuality.LOSSLESS: 0
-    }
-    return crf_map.get(quality, 18)
+    return _CRF_BY_QUALITY.get(quality, 18)
 
 
 def get_compatible_codec_for_format(user_codec: AudioCodec, file_extension: str) -> str:
@@ -82,22 +161,8 @@ def get_compatible_codec_for_format(user_codec: AudioCodec, file_extension: str)
     Returns:
         Compatible codec string for PyAV
     """
-    # Map extensions to required codecs for compatibility
-    extension_codec_map = {
-        'mp3': AudioCodec.MP3.value,
-        'flac': AudioCodec.FLAC.value,
-        'ogg': AudioCodec.LIBOPUS.value,
-        'wav': AudioCodec.PCM_S16LE.value,
-        'm4a': AudioCodec.AAC.value,
-        'ipod': AudioCodec.AAC.value,  # iPod format (alternative M4A name)
-    }
-
-    # If extension requires specific codec, use it
-    if file_extension.lower() in extension_codec_map:
-        return extension_codec_map[file_extension.lower()]
-
-    # Otherwise use user's choice
-    return user_codec.value
+    # If extension requires specific codec, use it, otherwise use user's choice
+    return _REQUIRED_AUDIO_CODEC_BY_EXTENSION.get(file_extension.lower(), user_codec.value)
 
 
 def get_audio_only_formats() -> list[str]:
@@ -106,7 +171,7 @@ def get_audio_only_formats() -> list[str]:
     Returns:
         List of file extensions that are audio-only
     """
-    return ['mp3', 'flac', 'ogg', 'wav', 'm4a', 'ipod']
+    return list(_AUDIO_ONLY_FORMATS)
 
 
 def is_audio_only_format(file_extension: str) -> bool:
@@ -118,11 +183,12 @@ def is_audio_only_format(file_extension: str) -> bool:
     Returns:
         True if format is audio-only
     """
-    ext = file_extension.lower().lstrip('.')
-    return ext in get_audio_only_formats()
+    ext = _normalize_extension(file_extension)
+    return ext in _AUDIO_ONLY_FORMATS_SET
 
 # --- Validation helpers centralizing media rules ---
 
+@lru_cache(maxsize=32)
 def _normalize_video_codec_name(name: str) -> str:
     """Normalize user-provided video encoder name to canonical form.
 
@@ -142,7 +208,7 @@ def validate_video_container_compat(encoder_name: str, container_ext: str) -> li
     """
     errors: list[str] = []
     enc = _normalize_video_codec_name(encoder_name)
-    ext = container_ext.lower().lstrip('.')
+    ext = _normalize_extension(container_ext)
 
     # H.264 in OGG is not a supported combination
     if enc == 'h264' and ext == 'ogg':
@@ -163,9 +229,8 @@ def validate_audio_track_limits_for_container(container_ext: str, total_audio_tr
     if total_audio_tracks <= 1:
         return errors
 
-    ext = container_ext.lower().lstrip('.')
-    single_track_formats = ['ogg', 'mp3', 'm4a', 'flac', 'wav']
-    if ext in single_track_formats:
+    ext = _normalize_extension(container_ext)
+    if ext in _SINGLE_AUDIO_TRACK_FORMATS:
         errors.append(f"{ext.upper()} format can only have 1 audio track, but {total_audio_tracks} were selected")
     return errors
 
@@ -179,31 +244,12 @@ def get_valid_audio_codecs_for_container(container_ext: str) -> list[AudioCodec]
     Returns:
         List of AudioCodec enum values compatible with the container
     """
-    ext = container_ext.lower().lstrip('.')
-
-    # Audio-only containers have strict requirements
-    audio_only_map = {
-        'mp3': [AudioCodec.MP3],
-        'flac': [AudioCodec.FLAC],
-        'wav': [AudioCodec.PCM_S16LE, AudioCodec.PCM_F32LE],
-        'ogg': [AudioCodec.LIBOPUS, AudioCodec.LIBVORBIS],
-        'm4a': [AudioCodec.AAC],
-        'ipod': [AudioCodec.AAC],
-    }
-
-    if ext in audio_only_map:
-        return audio_only_map[ext]
+    ext = _normalize_extension(container_ext)
 
-    # Video containers
-    video_container_map = {
-        'mp4': [AudioCodec.AAC, AudioCodec.MP3],
-        'mov': [AudioCodec.AAC, AudioCodec.MP3],
-        'mkv': [AudioCodec.AAC, AudioCodec.MP3, AudioCodec.LIBOPUS, AudioCodec.FLAC, AudioCodec.PCM_S16LE],
-        'webm': [AudioCodec.LIBOPUS, AudioCodec.LIBVORBIS],
-        'avi': [AudioCodec.MP3, AudioCodec.PCM_S16LE],
-    }
-
-    return video_container_map.get(ext, [AudioCodec.AAC, AudioCodec.MP3])
+    codecs = _AUDIO_ONLY_CONTAINER_AUDIO_CODECS.get(ext)
+    if codecs is None:
+        codecs = _VIDEO_CONTAINER_AUDIO_CODECS.get(ext, _DEFAULT_AUDIO_CODECS)
+    return list(codecs)
 
 
 def get_valid_video_codecs_for_container(container_ext: str) -> list[VideoCodec]:
@@ -215,17 +261,8 @@ def get_valid_video_codecs_for_container(container_ext: str) -> list[VideoCodec]
     Returns:
         List of VideoCodec enum values compatible with the container
     """
-    ext = container_ext.lower().lstrip('.')
-
-    container_map = {
-        'mp4': [VideoCodec.H264, VideoCodec.HEVC, VideoCodec.AV1],
-        'mov': [VideoCodec.H264, VideoCodec.HEVC],
-        'mkv': [VideoCodec.H264, VideoCodec.HEVC, VideoCodec.VP9, VideoCodec.AV1],
-        'webm': [VideoCodec.VP9, VideoCodec.AV1],
-        'avi': [VideoCodec.H264],
-    }
-
-    return container_map.get(ext, [VideoCodec.H264, VideoCodec.HEVC])
+    ext = _normalize_extension(container_ext)
+    return list(_CONTAINER_VIDEO_CODECS.get(ext, _DEFAULT_VIDEO_CODECS))
 
 
 def get_default_audio_codec_for_container(container_ext: str) -> AudioCodec:
@@ -237,31 +274,8 @@ def get_default_audio_codec_for_container(container_ext: str) -> AudioCodec:
     Returns:
         Default AudioCodec for the container
     """
-    ext = container_ext.lower().lstrip('.')
-
-    # Audio-only containers have specific defaults
-    audio_only_defaults = {
-        'mp3': AudioCodec.MP3,
-        'flac': AudioCodec.FLAC,
-        'wav': AudioCodec.PCM_S16LE,
-        'ogg': AudioCodec.LIBOPUS,
-        'm4a': AudioCodec.AAC,
-        'ipod': AudioCodec.AAC,
-    }
-
-    if ext in audio_only_defaults:
-        return audio_only_defaults[ext]
-
-    # Video container defaults
-    video_defaults = {
-        'mp4': AudioCodec.AAC,
-        'mov': AudioCodec.AAC,
-        'mkv': AudioCodec.AAC,
-        'webm': AudioCodec.LIBOPUS,
-        'avi': AudioCodec.MP3,
-    }
-
-    return video_defaults.get(ext, AudioCodec.AAC)
+    ext = _normalize_extension(container_ext)
+    return _DEFAULT_AUDIO_CODEC_BY_CONTAINER.get(ext, AudioCodec.AAC)
 
 
 def get_default_video_codec_for_container(container_ext: str) -> VideoCodec:
@@ -273,14 +287,5 @@ def get_default_video_codec_for_container(container_ext: str) -> VideoCodec:
     Returns:
         Default VideoCodec for the container
     """
-    ext = container_ext.lower().lstrip('.')
-
-    container_defaults = {
-        'mp4': VideoCodec.H264,
-        'mov': VideoCodec.H264,
-        'mkv': VideoCodec.H264,
-        'webm': VideoCodec.VP9,
-        'avi': VideoCodec.H264,
-    }
-
-    return container_defaults.get(ext, VideoCodec.H264)
+    ext = _normalize_extension(container_ext)
+    return _DEFAULT_VIDEO_CODEC_BY_CONTAINER.get(ext, VideoCodec.H264)
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from fractions import Fraction
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioExportSettings:
     codec: str
     channels: str | None = None
@@ -10,11 +10,11 @@ class AudioExportSettings:
     sample_rate: int | None = None
     denoise: int = -1
 
-@dataclass
+@dataclass(slots=True)
 class AudioExportInfo:
     output_tracks: list[AudioExportSettings | None] = field(default_factory=lambda: [])
 
-@dataclass
+@dataclass(slots=True)
 class CutSegment:
     require_recode: bool
     start_time: Fraction
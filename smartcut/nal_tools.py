@@ -1,4 +1,77 @@
-def get_h265_nal_unit_type(packet_data: bytes) -> int | None:
+import re
+import struct
+from collections.abc import Generator
+
+_START_CODE_4 = b'\x00\x00\x00\x01'
+_START_CODE_3 = b'\x00\x00\x01'
+# Compiled pattern searches any buffer in place (bytes.find needs a bytes copy of a memoryview)
+_START_CODE_3_RE = re.compile(re.escape(_START_CODE_3))
+# NAL type sets as bitmasks (bit n set = type n in the set), one shift and AND per lookup
+_H264_SAFE_KEYFRAME_MASK = (1 << 5) | (1 << 6) | (1 << 7) | (1 << 8)
+_H265_SAFE_KEYFRAME_MASK = sum(1 << t for t in (16, 17, 18, 19, 20, 21, 32, 33, 34))
+_RASL_MASK = (1 << 8) | (1 << 9)
+_RADL_MASK = (1 << 6) | (1 << 7)
+_LEADING_PICTURE_MASK = _RASL_MASK | _RADL_MASK
+
+# Big-endian NAL length prefix, unpack_from reads it in place without slicing the packet
+_NAL_LENGTH = struct.Struct('>I')
+
+
+def _is_length_prefixed(packet_data: bytes | memoryview, data_len: int) -> bool:
+    """True if the packet looks like MP4/ISOBMFF style length-prefixed NAL units."""
+    # Read the first NAL unit length (big-endian 4 bytes)
+    nal_length = _NAL_LENGTH.unpack_from(packet_data)[0]
+    # Avoid misinterpreting Annex B start codes as MP4 lengths
+    # Annex B start codes are 0x00000001 or 0x000001, which would be lengths 1 or very small
+    return nal_length > 4 and nal_length <= data_len - 4
+
+
+def _first_nal_header_offset(packet_data: bytes | memoryview, data_len: int) -> int:
+    """
+    Offset of the first NAL header byte, picked the same way the full scans below
+    pick their format: length-prefixed first, then 4-byte and 3-byte start codes.
+    Returns -1 if the packet doesn't start with either.
+    """
+    if _is_length_prefixed(packet_data, data_len):
+        return 4
+    if packet_data[:4] == _START_CODE_4:
+        return 4
+    if packet_data[:3] == _START_CODE_3:
+        return 3
+    return -1
+
+
+def _length_prefixed_nal_header_offsets(packet_data: bytes | memoryview, data_len: int, header_size: int) -> Generator[int, None, None]:
+    """Offsets of the NAL headers in a length-prefixed packet, stopping at the first invalid length."""
+    i = 0
+    while i < data_len - 4:
+        nal_len = _NAL_LENGTH.unpack_from(packet_data, i)[0]
+        if nal_len < header_size or nal_len > data_len - i - 4:
+            break  # Invalid NAL length
+        if i + 4 + header_size <= data_len:
+            yield i + 4
+        i += 4 + nal_len
+
+
+def _annexb_nal_header_offsets(packet_data: bytes | memoryview, data_len: int, header_size: int) -> Generator[int, None, None]:
+    """
+    Offsets of the NAL headers in an Annex B packet, in one forward pass.
+
+    A 4-byte start code ends in a 3-byte one and the NAL header follows it at the
+    same offset, so only 00 00 01 is searched for. Headers that don't fit in the
+    packet are skipped.
+    """
+    pos = 0
+    for match in _START_CODE_3_RE.finditer(packet_data):
+        if pos >= data_len - 3 - header_size:
+            break
+        idx = match.start()
+        if idx + 3 + header_size <= data_len:
+            yield idx + 3
+        pos = idx + 3
+
+
+def get_h265_nal_unit_type(packet_data: bytes | memoryview) -> int | None:
     """
     Extract NAL unit type from H.265/HEVC packet data.
     For packets with multiple NAL units, prioritizes picture NAL types (0-21)
@@ -12,95 +85,51 @@ def get_h265_nal_unit_type(packet_data: bytes) -> int | None:
     - 21: CRA frame (not safe for cutting due to RASL pictures)
     - 32-34: VPS, SPS, PPS (parameter sets)
     - 35: AUD (Access Unit Delimiter)
+
+    Accepts bytes or a memoryview (e.g. memoryview(packet)) so callers can avoid
+    copying the whole packet payload just to read the NAL headers.
     """
     if not packet_data or len(packet_data) < 6:
         return None
 
     data_len = len(packet_data)
 
-    # H.265 in MP4 containers uses length-prefixed NAL units, not Annex B start codes
-    # Try MP4/ISOBMFF format first (4-byte length prefix)
-    # Read the first NAL unit length (big-endian 4 bytes)
-    nal_length = int.from_bytes(packet_data[:4], byteorder='big')
-    # Avoid misinterpreting Annex B start codes as MP4 lengths
-    # Annex B start codes are 0x00000001 or 0x000001, which would be lengths 1 or very small
-    if nal_length > 4 and nal_length <= data_len - 4:
-        # Found valid length-prefixed NAL units - scan all of them
-        nal_types_found = []
-        i = 0
-        while i < data_len - 4:
-            nal_len = int.from_bytes(packet_data[i:i+4], byteorder='big')
-            if nal_len < 2 or nal_len > data_len - i - 4:
-                break  # Invalid NAL length
-            if i + 5 < data_len:
-                nal_type = (packet_data[i + 4] >> 1) & 0x3F
-                nal_types_found.append(nal_type)
-                # Found safe keyframe - prioritize these
-                if nal_type in (16, 17, 18, 19, 20):  # BLA or IDR frames
-                    return nal_type
-            i += 4 + nal_len
-
-        # No safe keyframes found, prioritize picture types (0-21) over metadata (32-40)
-        if nal_types_found:
-            # First check for CRA frames (21) - these are picture types but need special handling
-            for nal_type in nal_types_found:
-                if nal_type == 21:  # CRA frame
-                    return nal_type
-            # Then check for any other picture NAL types (0-15)
-            for nal_type in nal_types_found:
-                if 0 <= nal_type <= 15:  # Other picture types
-                    return nal_type
-            # Finally return first metadata type if no pictures found
-            return nal_types_found[0]
-
-    # Try Annex B format (start codes) - use bytes.find() for fast C-level search
-    nal_types_found = []
-    start_code_4 = b'\x00\x00\x00\x01'
-    start_code_3 = b'\x00\x00\x01'
-    pos = 0
-
-    while pos < data_len - 5:  # H.265 needs 2 bytes for NAL header after start code
-        # Search for 4-byte start code first
-        idx4 = packet_data.find(start_code_4, pos)
-        idx3 = packet_data.find(start_code_3, pos)
-
-        # No more start codes found
-        if idx4 == -1 and idx3 == -1:
-            break
-
-        # Use whichever comes first (prefer 4-byte if at same position)
-        if idx4 != -1 and (idx3 == -1 or idx4 <= idx3):
-            if idx4 + 6 <= data_len:
-                nal_type = (packet_data[idx4 + 4] >> 1) & 0x3F
-                nal_types_found.append(nal_type)
-                if nal_type in (16, 17, 18, 19, 20):  # BLA or IDR frames
-                    return nal_type
-            pos = idx4 + 4
-        else:
-            # idx3 comes first and isn't part of a 4-byte sequence
-            if idx3 + 5 <= data_len:
-                nal_type = (packet_data[idx3 + 3] >> 1) & 0x3F
-                nal_types_found.append(nal_type)
-                if nal_type in (16, 17, 18, 19, 20):  # BLA or IDR frames
-                    return nal_type
-            pos = idx3 + 3
-
-    # No safe keyframes found, prioritize picture types (0-21) over metadata (32-40)
-    if nal_types_found:
-        # First check for CRA frames (21) - these are picture types but need special handling
-        for nal_type in nal_types_found:
-            if nal_type == 21:  # CRA frame
-                return nal_type
-
-        # Then check for any other picture NAL types (0-15)
-        for nal_type in nal_types_found:
-            if 0 <= nal_type <= 15:  # Other picture types
-                return nal_type
-
-        # Finally return first metadata type if no pictures found
-        return nal_types_found[0]
-
-    return None
+    # Fast path: most keyframes start with the IDR/BLA slice itself, and the full
+    # scan below returns the first one of those it sees anyway
+    offset = _first_nal_header_offset(packet_data, data_len)
+    if offset >= 0:
+        nal_type = (packet_data[offset] >> 1) & 0x3F
+        if 16 <= nal_type <= 20:
+            return nal_type
+
+    # H.265 in MP4 containers uses length-prefixed NAL units, not Annex B start codes,
+    # otherwise fall back to scanning for start codes
+    offsets = (_length_prefixed_nal_header_offsets(packet_data, data_len, 2) if _is_length_prefixed(packet_data, data_len)
+               else _annexb_nal_header_offsets(packet_data, data_len, 2))  # H.265 NAL header is 2 bytes
+
+    # Safe keyframes are returned right away. Otherwise prioritize CRA (a picture
+    # type that needs special handling), then other picture types (0-15), then
+    # the first metadata type. Only the first of each is needed, no list.
+    has_cra = False
+    first_picture_type = None
+    first_other_type = None
+    for offset in offsets:
+        nal_type = (packet_data[offset] >> 1) & 0x3F
+        if 16 <= nal_type <= 20:  # BLA or IDR frames
+            return nal_type
+        if nal_type == 21:  # CRA frame
+            has_cra = True
+        elif nal_type <= 15:
+            if first_picture_type is None:
+                first_picture_type = nal_type
+        elif first_other_type is None:
+            first_other_type = nal_type
+
+    if has_cra:
+        return 21
+    if first_picture_type is not None:
+        return first_picture_type
+    return first_other_type
 
 
 def is_safe_h264_keyframe_nal(nal_type: int | None) -> bool:
@@ -116,7 +145,7 @@ def is_safe_h264_keyframe_nal(nal_type: int | None) -> bool:
     if nal_type is None:
         return True # Can't know for sure
     # Accept IDR frames (5), SEI (6), and parameter sets (7,8) as cutting points
-    return nal_type in [5, 6, 7, 8]
+    return nal_type >= 0 and bool((_H264_SAFE_KEYFRAME_MASK >> nal_type) & 1)
 
 
 def is_safe_h265_keyframe_nal(nal_type: int | None) -> bool:
@@ -132,7 +161,7 @@ def is_safe_h265_keyframe_nal(nal_type: int | None) -> bool:
     if nal_type is None:
         return True  # Can't know for sure
     # Accept BLA(16,17,18), IDR(19,20), CRA(21) frames and parameter sets (32,33,34)
-    return nal_type in [16, 17, 18, 19, 20, 21, 32, 33, 34]
+    return nal_type >= 0 and bool((_H265_SAFE_KEYFRAME_MASK >> nal_type) & 1)
 
 
 def is_rasl_nal_type(nal_type: int | None) -> bool:
@@ -151,7 +180,7 @@ def is_rasl_nal_type(nal_type: int | None) -> bool:
     """
     if nal_type is None:
         return False
-    return nal_type in [8, 9]  # RASL_N (8), RASL_R (9)
+    return nal_type >= 0 and bool((_RASL_MASK >> nal_type) & 1)  # RASL_N (8), RASL_R (9)
 
 
 def is_radl_nal_type(nal_type: int | None) -> bool:
@@ -170,7 +199,7 @@ def is_radl_nal_type(nal_type: int | None) -> bool:
     """
     if nal_type is None:
         return False
-    return nal_type in [6, 7]  # RADL_N (6), RADL_R (7)
+    return nal_type >= 0 and bool((_RADL_MASK >> nal_type) & 1)  # RADL_N (6), RADL_R (7)
 
 
 def is_leading_picture_nal_type(nal_type: int | None) -> bool:
@@ -188,10 +217,12 @@ def is_leading_picture_nal_type(nal_type: int | None) -> bool:
     Returns:
         bool: True if this is a leading picture NAL type (RASL or RADL)
     """
-    return is_rasl_nal_type(nal_type) or is_radl_nal_type(nal_type)
+    if nal_type is None:
+        return False
+    return nal_type >= 0 and bool((_LEADING_PICTURE_MASK >> nal_type) & 1)
 
 
-def get_h264_nal_unit_type(packet_data: bytes) -> int | None:
+def get_h264_nal_unit_type(packet_data: bytes | memoryview) -> int | None:
     """
     Extract NAL unit type from H.264/AVC packet data.
     For packets with multiple NAL units, prioritizes picture NAL types (1-5)
@@ -203,78 +234,36 @@ def get_h264_nal_unit_type(packet_data: bytes) -> int | None:
     - 1-4: Non-IDR slices (picture data, priority over metadata)
     - 7, 8: SPS, PPS (parameter sets)
     - 9: AUD (Access Unit Delimiter)
+
+    Accepts bytes or a memoryview, same as get_h265_nal_unit_type.
     """
     if not packet_data or len(packet_data) < 5:
         return None
 
     data_len = len(packet_data)
 
-    # H.264 in MP4 containers uses length-prefixed NAL units, not Annex B start codes
-    # Try MP4/ISOBMFF format first (4-byte length prefix)
-    # Read the first NAL unit length (big-endian 4 bytes)
-    nal_length = int.from_bytes(packet_data[:4], byteorder='big')
-    # Avoid misinterpreting Annex B start codes as MP4 lengths
-    # Annex B start codes are 0x00000001 or 0x000001, which would be lengths 1 or very small
-    if nal_length > 4 and nal_length <= data_len - 4:
-        # Found valid length-prefixed NAL units - scan all of them
-        nal_types_found = []
-        i = 0
-        while i < data_len - 4:
-            nal_len = int.from_bytes(packet_data[i:i+4], byteorder='big')
-            if nal_len < 1 or nal_len > data_len - i - 4:
-                break  # Invalid NAL length
-            if i + 4 < data_len:
-                nal_type = packet_data[i + 4] & 0x1F
-                nal_types_found.append(nal_type)
-                # Found IDR frame - highest priority!
-                if nal_type == 5:
-                    return 5
-            i += 4 + nal_len
-
-        # No IDR found, prioritize picture types (1-4) over metadata types (6-9)
-        if nal_types_found:
-            for nal_type in nal_types_found:
-                if 1 <= nal_type <= 4:  # Non-IDR picture types
-                    return nal_type
-            return nal_types_found[0]
-
-    # Try Annex B format (start codes) - use bytes.find() for fast C-level search
-    nal_types_found = []
-    start_code_4 = b'\x00\x00\x00\x01'
-    start_code_3 = b'\x00\x00\x01'
-    pos = 0
-
-    while pos < data_len - 4:  # H.264 needs 1 byte for NAL header after start code
-        # Search for 4-byte start code first
-        idx4 = packet_data.find(start_code_4, pos)
-        idx3 = packet_data.find(start_code_3, pos)
-
-        # No more start codes found
-        if idx4 == -1 and idx3 == -1:
-            break
-
-        # Use whichever comes first (prefer 4-byte if at same position)
-        if idx4 != -1 and (idx3 == -1 or idx4 <= idx3):
-            if idx4 + 5 <= data_len:
-                nal_type = packet_data[idx4 + 4] & 0x1F
-                nal_types_found.append(nal_type)
-                if nal_type == 5:  # Found IDR frame - highest priority!
-                    return 5
-            pos = idx4 + 4
-        else:
-            # idx3 comes first and isn't part of a 4-byte sequence
-            if idx3 + 4 <= data_len:
-                nal_type = packet_data[idx3 + 3] & 0x1F
-                nal_types_found.append(nal_type)
-                if nal_type == 5:  # Found IDR frame - highest priority!
-                    return 5
-            pos = idx3 + 3
-
-    # No IDR found, prioritize picture types (1-4) over metadata types (6-9)
-    if nal_types_found:
-        for nal_type in nal_types_found:
-            if 1 <= nal_type <= 4:  # Non-IDR picture types
-                return nal_type
-        return nal_types_found[0]
-
-    return None
+    # Fast path: a packet starting with an IDR slice, same answer as the full scan
+    offset = _first_nal_header_offset(packet_data, data_len)
+    if offset >= 0 and packet_data[offset] & 0x1F == 5:
+        return 5
+
+    # H.264 in MP4 containers uses length-prefixed NAL units, not Annex B start codes,
+    # otherwise fall back to scanning for start codes
+    offsets = (_length_prefixed_nal_header_offsets(packet_data, data_len, 1) if _is_length_prefixed(packet_data, data_len)
+               else _annexb_nal_header_offsets(packet_data, data_len, 1))  # H.264 NAL header is 1 byte
+
+    # IDR is returned right away, otherwise prioritize picture types (1-4) over
+    # metadata types (6-9)
+    first_picture_type = None
+    first_other_type = None
+    for offset in offsets:
+        nal_type = packet_data[offset] & 0x1F
+        if nal_type == 5:  # Found IDR frame - highest priority!
+            return 5
+        if 1 <= nal_type <= 4:
+            if first_picture_type is None:
+                first_picture_type = nal_type
+        elif first_other_type is None:
+            first_other_type = nal_type
+
+    return first_picture_type if first_picture_type is not None else first_other_type
@@ -1,13 +1,15 @@
+import math
 import os
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from fractions import Fraction
-from typing import Protocol, TypeAlias
+from typing import Protocol, TypeAlias, cast
 
 import av
+import numpy as np
 from av.container.output import OutputContainer
 from av.packet import Packet
 
-from smartcut.media_container import MediaContainer
+from smartcut.media_container import MediaContainer, pts_to_time
 from smartcut.media_utils import VideoExportMode
 from smartcut.misc_data import AudioExportInfo, CutSegment
 from smartcut.track_cutters import (
@@ -34,7 +36,7 @@ class ProgressCallback(Protocol):
 
 class StreamGenerator(Protocol):
     """Protocol for stream generators that produce packets for output."""
-    def segment(self, cut_segment: CutSegment) -> list[Packet]: ...
+    def segment(self, cut_segment: CutSegment) -> Iterable[Packet]: ...
     def finish(self) -> list[Packet]: ...
 
 
@@ -63,8 +65,9 @@ def make_cut_segments(media_container: MediaContainer,
     cut_segments = []
     if media_container.video_stream is None:
         first_audio_track = media_container.audio_tracks[0]
-        min_time = first_audio_track.frame_times[0]
-        max_time = first_audio_track.frame_times[-1] + Fraction(1,10000)
+        audio_time_base = cast(Fraction, first_audio_track.av_stream.time_base)
+        min_time = pts_to_time(first_audio_track.frame_times_pts[0], audio_time_base)
+        max_time = pts_to_time(first_audio_track.frame_times_pts[-1], audio_time_base) + Fraction(1,10000)
         for p in positive_segments:
             s = max(p[0], min_time)
             e = min(p[1], max_time)
@@ -74,26 +77,60 @@ def make_cut_segments(media_container: MediaContainer,
             cut_segments.append(CutSegment(False, s, e))
         return cut_segments
 
-    source_cutpoints = [*media_container.gop_start_times_pts_s, media_container.start_time + media_container.duration + Fraction(1,10000)]
+    time_base = cast(Fraction, media_container.video_stream.time_base)
+    end_cutpoint = Fraction(media_container.start_time + media_container.duration + Fraction(1,10000))
+    source_cutpoints = [*media_container.gop_start_times_pts_s, end_cutpoint]
+
+    # Fraction comparisons cross-multiply on every call. Scale all the times to a common
+    # denominator once and compare plain ints in the loop, which is exact (unlike rounding
+    # to PTS ticks). The Fractions are still used for the CutSegments themselves.
+    # Segment bounds may also be ints or floats, Fraction() gives their exact value.
+    segment_bounds = [(Fraction(s), Fraction(e)) for s, e in positive_segments]
+    denominator = math.lcm(time_base.denominator, end_cutpoint.denominator,
+                           *(t.denominator for segment in segment_bounds for t in segment))
+    pts_scale = time_base.numerator * (denominator // time_base.denominator)
+    cutpoint_ticks = [pts * pts_scale for pts in media_container.gop_start_times_pts.tolist()]
+    cutpoint_ticks.append(end_cutpoint.numerator * (denominator // end_cutpoint.denominator))
+    segment_ticks = [(s.numerator * (denominator // s.denominator), e.numerator * (denominator // e.denominator))
+                     for s, e in segment_bounds]
+    segment_count = len(positive_segments)
+
     p = 0
-    for gop_idx, (i, o, i_dts, o_dts) in enumerate(zip(source_cutpoints[:-1], source_cutpoints[1:], media_container.gop_start_times_dts, media_container.gop_end_times_dts)):
-        while p < len(positive_segments) and positive_segments[p][1] <= i:
+    # tolist() so the CutSegments get plain ints rather than numpy scalars
+    gop_start_dts = media_container.gop_start_times_dts.tolist()
+    gop_end_dts = media_container.gop_end_times_dts.tolist()
+    gop_start_pts = media_container.gop_start_times_pts
+    gop_count = min(len(source_cutpoints) - 1, len(gop_start_dts), len(gop_end_dts))
+    gop_idx = 0
+    while gop_idx < gop_count:
+        i_ticks, o_ticks = cutpoint_ticks[gop_idx], cutpoint_ticks[gop_idx + 1]
+        while p < segment_count and segment_ticks[p][1] <= i_ticks:
             p += 1
 
         # Three cases: no overlap, complete overlap, and partial overlap
-        if p == len(positive_segments) or o <= positive_segments[p][0]:
-            pass
-        elif keyframe_mode or (i >= positive_segments[p][0] and o <= positive_segments[p][1]):
+        if p == segment_count:
+            break
+        if o_ticks <= segment_ticks[p][0]:
+            # No overlap. Jump to the GOP containing the start of the next positive segment,
+            # the GOPs in between can't overlap it either. pts * tb <= t  <=>  pts <= floor(t / tb)
+            next_gop_idx = int(np.searchsorted(gop_start_pts, segment_ticks[p][0] // pts_scale, side='right')) - 1
+            gop_idx = max(gop_idx + 1, next_gop_idx)
+            continue
+
+        i, o = source_cutpoints[gop_idx], source_cutpoints[gop_idx + 1]
+        i_dts, o_dts = gop_start_dts[gop_idx], gop_end_dts[gop_idx]
+        if keyframe_mode or (i_ticks >= segment_ticks[p][0] and o_ticks <= segment_ticks[p][1]):
             cut_segments.append(CutSegment(False, i, o, i_dts, o_dts, gop_idx))
         else:
-            if i > positive_segments[p][0]:
-                cut_segments.append(CutSegment(True, i, positive_segments[p][1], i_dts, o_dts, gop_idx))
+            if i_ticks > segment_ticks[p][0]:
+                cut_segments.append(CutSegment(True, i, segment_bounds[p][1], i_dts, o_dts, gop_idx))
                 p += 1
-            while p < len(positive_segments) and positive_segments[p][1] < o:
-                cut_segments.append(CutSegment(True, positive_segments[p][0], positive_segments[p][1], i_dts, o_dts, gop_idx))
+            while p < segment_count and segment_ticks[p][1] < o_ticks:
+                cut_segments.append(CutSegment(True, segment_bounds[p][0], segment_bounds[p][1], i_dts, o_dts, gop_idx))
                 p += 1
-            if p < len(positive_segments) and positive_segments[p][0] < o:
-                cut_segments.append(CutSegment(True, positive_segments[p][0], o, i_dts, o_dts, gop_idx))
+            if p < segment_count and segment_ticks[p][0] < o_ticks:
+                cut_segments.append(CutSegment(True, segment_bounds[p][0], o, i_dts, o_dts, gop_idx))
+        gop_idx += 1
 
     return cut_segments
 
@@ -115,17 +152,20 @@ def smart_cut(media_container: MediaContainer, positive_segments: list[tuple[Fra
     if segment_mode:
         output_files = []
         padding = len(str(len(adjusted_segment_times)))
+        # Split out_path once around where the segment index goes
+        pound_index = out_path.rfind("#")
+        if pound_index != -1:
+            path_prefix, path_suffix = out_path[:pound_index], out_path[pound_index + 1:]
+        else:
+            # Insert the segment index right before the last '.'
+            dot_index = out_path.rfind(".")
+            if dot_index != -1:
+                path_prefix, path_suffix = out_path[:dot_index], out_path[dot_index:]
+            else:
+                path_prefix, path_suffix = out_path, ""
         for i, s in enumerate(adjusted_segment_times):
             segment_index = str(i + 1).zfill(padding)  # Zero-pad the segment index
-            if "#" in out_path:
-                pound_index = out_path.rfind("#")
-                output_file = out_path[:pound_index] + segment_index + out_path[pound_index + 1:]
-            else:
-                # Insert the segment index right before the last '.'
-                dot_index = out_path.rfind(".")
-                output_file = out_path[:dot_index] + segment_index + out_path[dot_index:] if dot_index != -1 else f"{out_path}{segment_index}"
-
-            output_files.append((output_file, s))
+            output_files.append((f"{path_prefix}{segment_index}{path_suffix}", s))
 
     else:
         output_files = [(out_path, adjusted_segment_times[-1])]
@@ -146,10 +186,7 @@ def smart_cut(media_container: MediaContainer, positive_segments: list[tuple[Fra
 
             if supports_attachments:
                 # Copy attachment streams from the primary input container
-                for in_stream in media_container.av_container.streams:
-                    if getattr(in_stream, "type", None) != "attachment":
-                        continue
-
+                for in_stream in media_container.attachment_streams:
                     output_av_container.add_stream_from_template(in_stream)
 
             generators = []
@@ -186,10 +223,13 @@ def smart_cut(media_container: MediaContainer, positive_segments: list[tuple[Fra
                 assert s.start_time < s.end_time, f"Invalid segment: start_time {s.start_time} >= end_time {s.end_time}"
                 for g in generators:
                     for packet in g.segment(s):
-                        if packet.dts is not None and packet.dts < -900_000:
-                            packet.dts = None
-                        if packet.dts is not None and packet.dts > 1_000_000_000_000:
-                            print(f"BAD DTS: seg {s.start_time:.3f}-{s.end_time:.3f} gop={s.gop_index} recode={s.require_recode} pts={packet.pts} dts={packet.dts}")
+                        # Read dts once; both sanity checks share the None test
+                        dts = packet.dts
+                        if dts is not None:
+                            if dts < -900_000:
+                                packet.dts = None
+                            elif dts > 1_000_000_000_000:
+                                print(f"BAD DTS: seg {s.start_time:.3f}-{s.end_time:.3f} gop={s.gop_index} recode={s.require_recode} pts={packet.pts} dts={dts}")
                         output_av_container.mux(packet)
             for g in generators:
                 for packet in g.finish():
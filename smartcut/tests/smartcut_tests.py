@@ -8,13 +8,16 @@ import time
 import traceback
 from fractions import Fraction
 from itertools import pairwise
+from typing import cast
 
 import numpy as np
 import psutil
+from av import AudioStream
 from av import datasets as av_datasets
 from av import logging as av_logging
 from av import open as av_open
-from av.stream import Disposition
+from av.container.input import InputContainer
+from av.stream import Disposition, Stream
 from test_utils import (
     cached_download,
     check_audio_pts_timestamps,
@@ -29,10 +32,12 @@ from test_utils import (
     get_media_test_data_file,
     get_tears_of_steel_annexb,
     get_testvideos_jellyfish_h265_ts,
+    make_long_audio_mkv,
     make_video_and_audio_mkv,
     make_video_with_attachment,
     make_video_with_forced_subtitle,
     make_video_with_subtitles,
+    read_audio_packets,
     run_cut_on_keyframes_test,
     run_partial_smart_cut,
     run_smartcut_test,
@@ -41,8 +46,9 @@ from test_utils import (
 
 from smartcut.media_container import MediaContainer
 from smartcut.media_utils import VideoExportMode, VideoExportQuality
-from smartcut.misc_data import AudioExportInfo, AudioExportSettings
+from smartcut.misc_data import AudioExportInfo, AudioExportSettings, CutSegment
 from smartcut.smart_cut import make_cut_segments, smart_cut
+from smartcut.track_cutters import PassthruAudioCutter, create_audio_output_stream
 from smartcut.video_cutter import VideoSettings
 
 DEFAULT_SEED = 12345
@@ -157,6 +163,79 @@ def test_h264_multiple_cuts() -> None:
         result_container = MediaContainer(output_path)
         check_videos_equal(source, result_container)
 
+def test_batched_next_frame_times() -> None:
+    create_test_video(short_h264_path, 30, 'h264', 'yuv420p', 30, (32, 18))
+    source = MediaContainer(short_h264_path)
+
+    # Odd denominator so no query lands exactly halfway between two frames (float ties are ambiguous)
+    query_times = [Fraction(-1), Fraction(0), source.duration + 1,
+                   *[Fraction(random.randint(0, 300_000), 10_007) for _ in range(200)]]
+    batched = source.get_next_frame_times(np.array([float(t) for t in query_times]))
+    for t, b in zip(query_times, batched):
+        expected = source.get_next_frame_time(t)
+        assert abs(float(expected) - b) < 1e-6, f"Batched lookup mismatch at t={t}: {b} vs {float(expected)}"
+    source.close()
+
+def _reference_cut_segments(media_container: MediaContainer, positive_segments: list[tuple[Fraction, Fraction]], keyframe_mode: bool = False) -> list[CutSegment]:
+    """make_cut_segments' video path as a plain GOP-by-GOP loop over Fraction comparisons."""
+    cut_segments = []
+    source_cutpoints = [*media_container.gop_start_times_pts_s, media_container.start_time + media_container.duration + Fraction(1,10000)]
+    p = 0
+    for gop_idx, (i, o, i_dts, o_dts) in enumerate(zip(source_cutpoints[:-1], source_cutpoints[1:], media_container.gop_start_times_dts.tolist(), media_container.gop_end_times_dts.tolist())):
+        while p < len(positive_segments) and positive_segments[p][1] <= i:
+            p += 1
+        if p == len(positive_segments) or o <= positive_segments[p][0]:
+            pass
+        elif keyframe_mode or (i >= positive_segments[p][0] and o <= positive_segments[p][1]):
+            cut_segments.append(CutSegment(False, i, o, i_dts, o_dts, gop_idx))
+        else:
+            if i > positive_segments[p][0]:
+                cut_segments.append(CutSegment(True, i, positive_segments[p][1], i_dts, o_dts, gop_idx))
+                p += 1
+            while p < len(positive_segments) and positive_segments[p][1] < o:
+                cut_segments.append(CutSegment(True, positive_segments[p][0], positive_segments[p][1], i_dts, o_dts, gop_idx))
+                p += 1
+            if p < len(positive_segments) and positive_segments[p][0] < o:
+                cut_segments.append(CutSegment(True, positive_segments[p][0], o, i_dts, o_dts, gop_idx))
+    return cut_segments
+
+def test_make_cut_segments_exact() -> None:
+    """make_cut_segments' integer tick comparisons and GOP skipping match the Fraction loop, for any number type."""
+    create_test_video(short_h264_path, 30, 'h264', 'yuv420p', 30, (32, 18))
+    source = MediaContainer(short_h264_path)
+    gop_starts = source.gop_start_times_pts_s
+    assert len(gop_starts) > 20
+
+    cases: list[list[tuple[Fraction, Fraction]]] = [
+        # Gaps spanning many GOPs, so the loop jumps ahead with searchsorted
+        [(gop_starts[1] + Fraction(1, 7), gop_starts[2] + Fraction(1, 3)), (gop_starts[12] - Fraction(1, 90), gop_starts[13]),
+         (gop_starts[25], gop_starts[26] + Fraction(1, 1000))],
+        # Bounds exactly on GOP starts and several segments inside one GOP
+        [(gop_starts[3], gop_starts[5]), (gop_starts[9] + Fraction(1, 10), gop_starts[9] + Fraction(2, 10)),
+         (gop_starts[9] + Fraction(3, 10), gop_starts[9] + Fraction(4, 10)), (gop_starts[20], source.duration)],
+        # Start before the file and end after it
+        [(Fraction(-10), Fraction(1, 2)), (Fraction(29), source.duration + 10)],
+    ]
+    for _ in range(50):
+        cutpoints = sorted({Fraction(random.randint(0, 30_000), random.choice([1000, 1001, 30, 7])) for _ in range(random.randint(2, 12))})
+        if len(cutpoints) % 2:
+            cutpoints.pop()
+        cases.append(list(zip(cutpoints[::2], cutpoints[1::2])))
+
+    for segments in cases:
+        for keyframe_mode in (False, True):
+            expected = _reference_cut_segments(source, segments, keyframe_mode)
+            assert make_cut_segments(source, segments, keyframe_mode) == expected, f"Mismatch for {segments} keyframe_mode={keyframe_mode}"
+
+    # float and int bounds compare by their exact value, like Fractions do
+    int_segments = [(2, 5), (11, 12), (20, 30)]
+    float_segments = [(1.25, 3.5), (10.1, 10.2), (17.0, 28.75)]
+    for segments in (int_segments, float_segments):
+        expected = _reference_cut_segments(source, [(Fraction(s), Fraction(e)) for s, e in segments])
+        assert make_cut_segments(source, cast(list[tuple[Fraction, Fraction]], segments)) == expected
+
+    source.close()
+
 def test_h265_cut_on_keyframes() -> None:
     create_test_video(short_h265_path, 30, 'hevc', 'yuv422p10le', 60, (256, 144))
     output_path = test_h265_cut_on_keyframes.__name__ + '.mkv'
@@ -633,6 +712,100 @@ def test_mp3_passthru() -> None:
     # Check PTS timestamps for suffix case
     check_audio_pts_timestamps(suffix_container, 15.0, "Suffix (15-30s)")
 
+class _SeekRecordingContainer:
+    """Input container proxy that logs seeks and can make them land seek_shift ticks late."""
+    def __init__(self, container: InputContainer, seeks: list[int], seek_shift: int) -> None:
+        self._container = container
+        self._seeks = seeks
+        self._seek_shift = seek_shift
+
+    def seek(self, offset: int, stream: Stream) -> None:
+        self._seeks.append(offset)
+        self._container.seek(offset + self._seek_shift, stream=stream)
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._container, name)
+
+class _SeekRecordingAudioCutter(PassthruAudioCutter):
+    def __init__(self, media_container: MediaContainer, out_stream: AudioStream, track_index: int, seek_shift: int = 0) -> None:
+        self.seeks: list[int] = []
+        self.seek_shift = seek_shift
+        super().__init__(media_container, out_stream, track_index)
+
+    def _open_input(self) -> None:
+        super()._open_input()
+        assert self.input_av_container is not None
+        self.input_av_container = cast(InputContainer, _SeekRecordingContainer(self.input_av_container, self.seeks, self.seek_shift))
+
+def _fetch_audio_packets(cutter: PassthruAudioCutter, start: int, end: int) -> list[tuple[int, bytes]]:
+    return [(cast(int, p.pts), bytes(p)) for p in cutter.fetch_packets(start, end)]
+
+def test_audio_passthru_seek() -> None:
+    """PassthruAudioCutter re-reads the same packets as a linear demux when it restarts or seeks."""
+    input_path = 'long_audio.mkv'
+    make_long_audio_mkv(input_path, 200)
+    reference = read_audio_packets(input_path)
+    n = len(reference)
+
+    source = MediaContainer(input_path)
+    in_tb = cast(Fraction, source.audio_tracks[0].av_stream.time_base)
+    with av_open(test_audio_passthru_seek.__name__ + '.mkv', 'w') as output_container:
+        cutter = _SeekRecordingAudioCutter(source, create_audio_output_stream(source, output_container, 0), 0)
+        assert cutter.can_seek
+
+        mid = n // 2
+        assert _fetch_audio_packets(cutter, mid, mid + 50) == reference[mid:mid + 50]
+        # Backwards request reopens the input and reads from the start
+        assert _fetch_audio_packets(cutter, 10, 60) == reference[10:60]
+        assert cutter.seeks == []
+
+        # A gap of more than 120 s is skipped with a seek, the index is recovered from the landing packet
+        far = n - 300
+        assert (reference[far][0] - reference[60][0]) * in_tb > 120
+        assert _fetch_audio_packets(cutter, far, far + 50) == reference[far:far + 50]
+        assert len(cutter.seeks) == 1
+        assert cutter.can_seek
+
+        cutter.finish()
+        assert cutter.input_av_container is None
+    source.close()
+
+def test_audio_passthru_seek_fallback() -> None:
+    """PassthruAudioCutter falls back to a linear read when a seek can't be mapped back to a packet index."""
+    input_path = 'long_audio.mkv'
+    make_long_audio_mkv(input_path, 200)
+    reference = read_audio_packets(input_path)
+    n = len(reference)
+    far = n - 300
+
+    source = MediaContainer(input_path)
+    in_tb = cast(Fraction, source.audio_tracks[0].av_stream.time_base)
+    with av_open(test_audio_passthru_seek_fallback.__name__ + '.mkv', 'w') as output_container:
+        # Seek lands 60 s late, past the requested packet
+        cutter = _SeekRecordingAudioCutter(source, create_audio_output_stream(source, output_container, 0), 0, seek_shift=int(60 / in_tb))
+        assert _fetch_audio_packets(cutter, 0, 50) == reference[:50]
+        assert _fetch_audio_packets(cutter, far, far + 50) == reference[far:far + 50]
+        assert len(cutter.seeks) == 1
+        assert not cutter.can_seek
+        cutter.finish()
+        assert cutter.input_av_container is None
+    source.close()
+
+    # Repeated pts can't be mapped back to an index, so this track never seeks
+    dup_input_path = 'long_audio_dup_pts.mkv'
+    make_long_audio_mkv(dup_input_path, 200, duplicate_pts_every=100)
+    reference = read_audio_packets(dup_input_path)
+    dup_source = MediaContainer(dup_input_path)
+    with av_open(test_audio_passthru_seek_fallback.__name__ + '_dup.mkv', 'w') as output_container:
+        cutter = _SeekRecordingAudioCutter(dup_source, create_audio_output_stream(dup_source, output_container, 0), 0)
+        assert not cutter.can_seek
+        assert _fetch_audio_packets(cutter, 0, 50) == reference[:50]
+        assert _fetch_audio_packets(cutter, far, far + 50) == reference[far:far + 50]
+        assert cutter.seeks == []
+        cutter.finish()
+        assert cutter.input_av_container is None
+    dup_source.close()
+
 def test_mkv_with_video_and_audio_passthru() -> None:
     file_duration = 30
 
@@ -1423,6 +1596,8 @@ def get_test_categories() -> dict[str, list]:
             test_mp4_smart_cut,
             test_no_discard_flag_on_output_packets,
             test_no_discard_flag_multiple_cuts,
+            test_batched_next_frame_times,
+            test_make_cut_segments_exact,
         ],
 
         'h264': [
@@ -1479,6 +1654,8 @@ def get_test_categories() -> dict[str, list]:
         'audio': [
             test_vorbis_passthru,
             test_mp3_passthru,
+            test_audio_passthru_seek,
+            test_audio_passthru_seek_fallback,
         ],
 
         'mixed': [
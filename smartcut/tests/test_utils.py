@@ -289,24 +289,22 @@ def check_audio_pts_timestamps(container: MediaContainer, max_expected_duration:
     time_base = track.av_stream.time_base
     assert time_base is not None, "Time base should not be None"
 
-    assert len(track.packets) > 0, "Audio track has no packets"
+    assert len(track.frame_times_pts) > 0, "Audio track has no packets"
 
-    first_packet = track.packets[0]
-    last_packet = track.packets[-1]
+    first_pts = int(track.frame_times_pts[0])
+    last_pts = int(track.frame_times_pts[-1])
 
     prefix = f"{test_name}: " if test_name else ""
 
     # Check first packet PTS is near 0
-    assert first_packet.pts is not None, f"{prefix}First packet should have PTS"
-    first_pts_time = float(first_packet.pts * time_base)
+    first_pts_time = float(first_pts * time_base)
     assert first_pts_time < 0.5, \
-        f"{prefix}First packet PTS should be near 0, got {first_pts_time:.6f}s (PTS={first_packet.pts})"
+        f"{prefix}First packet PTS should be near 0, got {first_pts_time:.6f}s (PTS={first_pts})"
 
     # Check last packet PTS is within expected range
-    assert last_packet.pts is not None, f"{prefix}Last packet should have PTS"
-    last_pts_time = float(last_packet.pts * time_base)
+    last_pts_time = float(last_pts * time_base)
     assert last_pts_time < max_expected_duration + 0.5, \
-        f"{prefix}Last packet PTS should be near {max_expected_duration}s, got {last_pts_time:.6f}s (PTS={last_packet.pts})"
+        f"{prefix}Last packet PTS should be near {max_expected_duration}s, got {last_pts_time:.6f}s (PTS={last_pts})"
 
 def _median_fraction(values: list[Fraction]) -> Fraction | None:
     if not values:
@@ -813,6 +811,42 @@ def make_video_and_audio_mkv(path: str, file_duration: float) -> None:
         .run(quiet=True)
     )
 
+def make_long_audio_mkv(path: str, file_duration: float, duplicate_pts_every: int | None = None) -> None:
+    """Create an audio-only AAC mkv. With duplicate_pts_every=n, every n-th packet repeats the previous pts."""
+    if os.path.exists(path):
+        return
+
+    tmp_path = 'tmp_' + path
+    (
+        ffmpeg
+        .input(f'sine=frequency=440:duration={file_duration}', f='lavfi')
+        .output(tmp_path, acodec='aac', audio_bitrate=64_000, y=None)
+        .run(quiet=True)
+    )
+    if duplicate_pts_every is None:
+        os.replace(tmp_path, path)
+        return
+
+    with av_open(tmp_path) as input_container, av_open(path, 'w') as output_container:
+        in_stream = input_container.streams.audio[0]
+        out_stream = output_container.add_stream_from_template(in_stream)
+        prev_pts = None
+        for i, packet in enumerate(input_container.demux(in_stream)):
+            if packet.dts is None:
+                continue
+            if i % duplicate_pts_every == duplicate_pts_every - 1 and prev_pts is not None:
+                packet.pts = prev_pts
+                packet.dts = prev_pts
+            prev_pts = packet.pts
+            packet.stream = out_stream
+            output_container.mux(packet)
+    os.remove(tmp_path)
+
+def read_audio_packets(path: str) -> list[tuple[int, bytes]]:
+    """(pts, payload) of every audio packet with a pts, in demux order (the order MediaContainer indexes them in)."""
+    with av_open(path) as container:
+        return [(p.pts, bytes(p)) for p in container.demux(container.streams.audio[0]) if p.pts is not None]
+
 def make_video_with_subtitles(path: str, file_duration: float, subtitle_configs: list[dict[str, str]]) -> str:
     """
     Create a video with multiple subtitle tracks.
@@ -1,8 +1,13 @@
+import bisect
+import math
+from collections.abc import Generator
 from fractions import Fraction
 from typing import cast
 
+import av
 import numpy as np
 from av import AudioStream
+from av.container.input import InputContainer
 from av.container.output import OutputContainer
 from av.packet import Packet
 from av.stream import Disposition, Stream
@@ -45,11 +50,87 @@ class PassthruAudioCutter:
         self.track = media_container.audio_tracks[track_index]
         self.out_stream = out_stream
 
+        # MediaContainer only keeps the packet PTS values, so the packets are re-read
+        # from a container of our own. packet indices are the same as in track.frame_times_pts
+        # The container is opened lazily on the first fetch_packets() call.
+        self.input_av_container: InputContainer | None = None
+        # Seeking relies on mapping a packet PTS back to its index, which needs unique sorted PTS
+        pts = self.track.frame_times_pts
+        self.can_seek = len(pts) > 1 and bool(np.all(pts[1:] > pts[:-1]))
+
         # Output position state - can be set for joining multiple files
         self.segment_start_in_output = initial_position
         self.prev_dts = initial_prev_dts
         self.prev_pts = initial_prev_pts
 
+    def _open_input(self) -> None:
+        # Reopen instead of seeking back to the start, which is unreliable for some formats
+        self.input_av_container = av.open(self.track.path, 'r', metadata_errors='ignore')
+        self.in_stream = self.input_av_container.streams.audio[self.track.index]
+        self.demux_iter = self.input_av_container.demux(self.in_stream)
+        self.demux_next_i: int | None = 0  # Index of the next packet from demux_iter, None if unknown after a seek
+        self.demux_saved_packet: tuple[int, Packet] | None = None
+
+    def fetch_packets(self, start: int, end: int) -> Generator[Packet, None, None]:
+        """Yield the track's packets with index in [start, end), in demux order."""
+        if start >= end:
+            return
+
+        if self.input_av_container is None:
+            self._open_input()
+        assert self.input_av_container is not None
+
+        # Index of the first packet not handed out yet
+        next_i = self.demux_saved_packet[0] if self.demux_saved_packet is not None else self.demux_next_i
+        if next_i is not None and start < next_i:
+            # Asked to go backwards, start over
+            self.input_av_container.close()
+            self._open_input()
+
+        if self.demux_saved_packet is not None:
+            saved_i, saved_packet = self.demux_saved_packet
+            if saved_i >= end:
+                return
+            self.demux_saved_packet = None
+            if saved_i >= start:
+                yield saved_packet
+                start = saved_i + 1
+                if start >= end:
+                    return
+
+        frame_times_pts = self.track.frame_times_pts
+        in_tb = cast(Fraction, self.track.av_stream.time_base)
+        if self.can_seek and self.demux_next_i is not None and start < len(frame_times_pts):
+            target_pts = int(frame_times_pts[start])
+            gap = (target_pts - int(frame_times_pts[min(self.demux_next_i, len(frame_times_pts) - 1)])) * in_tb
+            if gap > 120:
+                self.input_av_container.seek(int(target_pts - 30 / in_tb), stream=self.in_stream)
+                self.demux_iter = self.input_av_container.demux(self.in_stream)
+                self.demux_next_i = None
+
+        for packet in self.demux_iter:
+            # MediaContainer skips packets without PTS, so they don't have an index
+            if packet.pts is None:
+                continue
+            if self.demux_next_i is None:
+                seek_i = int(np.searchsorted(frame_times_pts, packet.pts))
+                if seek_i > start or seek_i >= len(frame_times_pts) or frame_times_pts[seek_i] != packet.pts:
+                    # Seek overshot the target or landed on an unknown packet, read from the start of the file instead
+                    self.can_seek = False
+                    self.input_av_container.close()
+                    self._open_input()
+                    yield from self.fetch_packets(start, end)
+                    return
+                self.demux_next_i = seek_i
+            i = self.demux_next_i
+            self.demux_next_i += 1
+            if i < start:
+                continue
+            if i >= end:
+                self.demux_saved_packet = (i, packet)
+                return
+            yield packet
+
     def segment(self, cut_segment: CutSegment) -> list[Packet]:
         in_tb = cast(Fraction, self.track.av_stream.time_base)
         if cut_segment.start_time <= 0:
@@ -59,16 +140,30 @@ class PassthruAudioCutter:
             start = np.searchsorted(self.track.frame_times_pts, start_pts)
         end_pts = round(cut_segment.end_time / in_tb)
         end = np.searchsorted(self.track.frame_times_pts, end_pts)
-        in_packets = self.track.packets[start : end]
+        # The timestamp shift is constant for the segment, so the Fraction math is done once.
+        # int(ts + shift) == ts + floor(shift), except that int() rounds negative results
+        # toward zero, which is one more when shift isn't whole.
+        shift = (self.segment_start_in_output - cut_segment.start_time) / in_tb
+        shift_floor = math.floor(shift)
+        shift_is_whole = shift == shift_floor
         packets = []
-        for p in in_packets:
+        for p in self.fetch_packets(int(start), int(end)):
             if p.dts is None or p.pts is None:
                 continue
-            packet = copy_packet(p)
-            # packet = p
+            # The packets come from our own demux and are handed out once, so they can be
+            # re-stamped in place. Discard/corrupt flags can't be cleared on a Packet, and
+            # copy_packet doesn't carry them over, so flagged packets still get copied.
+            packet = copy_packet(p) if p.is_discard or p.is_corrupt else p
             packet.stream = self.out_stream
-            packet.pts = int(p.pts + (self.segment_start_in_output - cut_segment.start_time) / in_tb)
-            packet.dts = int(p.dts + (self.segment_start_in_output - cut_segment.start_time) / in_tb)
+            pts = p.pts + shift_floor
+            dts = p.dts + shift_floor
+            if not shift_is_whole:
+                if pts < 0:
+                    pts += 1
+                if dts < 0:
+                    dts += 1
+            packet.pts = pts
+            packet.dts = dts
             if packet.pts <= self.prev_pts:
                 print("Correcting for too low pts in audio passthru")
                 packet.pts = self.prev_pts + 1
@@ -83,6 +178,9 @@ class PassthruAudioCutter:
         return packets
 
     def finish(self) -> list[Packet]:
+        if self.input_av_container is not None:
+            self.input_av_container.close()
+            self.input_av_container = None
         return []
 
 
@@ -122,30 +220,48 @@ class SubtitleCutter:
         self.prev_pts = initial_prev_pts
 
         self.current_packet_i = 0
+        # Source pts of each packet, read before segment() rewrites them for the output.
+        # Demuxed subtitle pts are normally in order; only then can the window be bisected.
+        self.packet_pts = [p.pts for p in self.packets]
+        self._packet_pts_sorted = all(a <= b for a, b in zip(self.packet_pts, self.packet_pts[1:]))
 
     def segment(self, cut_segment: CutSegment) -> list[Packet]:
         in_tb = cast(Fraction, self.in_stream.time_base)
         segment_start_pts = int(cut_segment.start_time / in_tb)
         segment_end_pts = int(cut_segment.end_time / in_tb)
 
-        out_packets = []
-
         # TODO: This is the simplest implementation of subtitle cutting. Investigate more complex logic.
         # We include subtitles for the whole original time if the subtitle start time is included in the output
         # Good: simple, Bad: 1) if start is cut it's not shown at all 2) we can show a subtitle for too long if there is cut after it's shown
-        while self.current_packet_i < len(self.packets):
-            p = self.packets[self.current_packet_i]
-            if p.pts < segment_start_pts:
-                self.current_packet_i += 1
-            elif p.pts >= segment_start_pts and p.pts < segment_end_pts:
-                out_packets.append(p)
-                self.current_packet_i += 1
-            else:
-                break
+        if self._packet_pts_sorted:
+            lo = bisect.bisect_left(self.packet_pts, segment_start_pts, lo=self.current_packet_i)
+            hi = bisect.bisect_left(self.packet_pts, segment_end_pts, lo=lo)
+            out_packets = self.packets[lo:hi]
+            self.current_packet_i = hi
+        else:
+            out_packets = []
+            packet_pts = self.packet_pts
+            while self.current_packet_i < len(self.packets):
+                pts = packet_pts[self.current_packet_i]
+                if pts < segment_start_pts:
+                    self.current_packet_i += 1
+                elif pts < segment_end_pts:
+                    out_packets.append(self.packets[self.current_packet_i])
+                    self.current_packet_i += 1
+                else:
+                    break
 
+        # Constant for the segment, do the Fraction math once. See PassthruAudioCutter.segment
+        # for why negative results need the extra correction.
+        out_shift = self.segment_start_in_output / in_tb
+        out_shift_floor = math.floor(out_shift)
+        out_shift_is_whole = out_shift == out_shift_floor
         for packet in out_packets:
             packet.stream = self.out_stream
-            packet.pts = int(packet.pts - segment_start_pts + self.segment_start_in_output / in_tb)
+            pts = packet.pts - segment_start_pts + out_shift_floor
+            if pts < 0 and not out_shift_is_whole:
+                pts += 1
+            packet.pts = pts
 
             if packet.pts < self.prev_pts:
                 print("Correcting for too low pts in subtitle passthru. This should not happen.")
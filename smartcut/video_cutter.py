@@ -1,12 +1,14 @@
-import heapq
+import bisect
+import itertools
+import re
 from collections.abc import Generator
 from dataclasses import dataclass
 from fractions import Fraction
 from typing import cast
 
 import av
-import av.bitstream
 from av import VideoCodecContext, VideoStream
+from av.bitstream import BitStreamFilterContext
 from av.codec.context import CodecContext
 from av.container.input import InputContainer
 from av.container.output import OutputContainer
@@ -14,33 +16,22 @@ from av.packet import Packet
 from av.stream import Disposition
 from av.video.frame import PictureType, VideoFrame
 
-from smartcut.media_container import MediaContainer
+from smartcut.media_container import DTS_UNKNOWN, MediaContainer
 from smartcut.media_utils import VideoExportMode, VideoExportQuality, get_crf_for_quality
 from smartcut.misc_data import CutSegment
 from smartcut.nal_tools import get_h265_nal_unit_type, is_leading_picture_nal_type
 
 
-@dataclass
-class FrameHeapItem:
-    """Wrapper for frames in the heap, sorted by PTS"""
-    pts: int | None
-    frame: VideoFrame
-
-    def __lt__(self, other: 'FrameHeapItem') -> bool:
-        # Handle None PTS values by treating them as -1 (earliest)
-        self_pts = self.pts if self.pts is not None else -1
-        other_pts = other.pts if other.pts is not None else -1
-        return self_pts < other_pts
-
 def is_annexb(packet: Packet | bytes | None) -> bool:
         if packet is None:
             return False
-        data = bytes(packet)
+        # Only the prefix matters, a memoryview avoids copying the whole buffer
+        data = memoryview(packet)
         return data[:3] == b'\0\0\x01' or data[:4] == b'\0\0\0\x01'
 
 def copy_packet(p: Packet) -> Packet:
-    # return p
-    packet = Packet(bytes(p))
+    # Packet reads the source through the buffer protocol, so no intermediate bytes copy
+    packet = Packet(p)
     packet.pts = p.pts
     packet.dts = p.dts
     packet.duration = p.duration
@@ -55,6 +46,30 @@ def copy_packet(p: Packet) -> Packet:
     return packet
 
 
+def _rescale_ts(ts: int, scale_num: int, offset_num: int, denom: int) -> int:
+    """(ts * scale_num + offset_num) / denom truncated toward zero, same as int() of the Fraction."""
+    x = ts * scale_num + offset_num
+    return x // denom if x >= 0 else -(-x // denom)
+
+
+# Enum member lookups go through EnumType, bind the one set on every recoded frame
+_PICT_TYPE_NONE = PictureType.NONE
+
+# x265 writes its settings into the extradata as "... options: a=1 b=2 ...\0". The value runs
+# to the next "options: " marker or the end of the buffer, its last byte is dropped below.
+_X265_OPTIONS_RE = re.compile(rb'options: (.*?)(?=options: |\Z)', re.DOTALL)
+
+# Codec names that end up in libx265, the only encoder that reads x265-params
+_X265_CODEC_NAMES = frozenset({'libx265', 'hevc', 'h265'})
+
+
+def _x265_quiet_kwargs(codec_name: str) -> dict:
+    """Stream kwargs that silence x265 logging, empty for codecs that aren't x265."""
+    if codec_name in _X265_CODEC_NAMES:
+        return {'options': {'x265-params': 'log_level=error'}}
+    return {}
+
+
 @dataclass
 class VideoSettings:
     mode: VideoExportMode
@@ -89,7 +104,7 @@ def create_video_output_stream(
         out_stream = cast(VideoStream, output_av_container.add_stream(
             video_settings.codec_override,
             rate=in_stream.guessed_rate,
-            options={'x265-params': 'log_level=error'}
+            **_x265_quiet_kwargs(video_settings.codec_override)
         ))
         out_stream.width = in_stream.width
         out_stream.height = in_stream.height
@@ -127,7 +142,7 @@ def create_video_output_stream(
             # Copy the stream if no mapping needed
             out_stream = output_av_container.add_stream_from_template(
                 in_stream,
-                options={'x265-params': 'log_level=error'}
+                **_x265_quiet_kwargs(original_codec_name)
             )
             out_stream.metadata.update(in_stream.metadata)
             out_stream.disposition = cast(Disposition, in_stream.disposition.value)
@@ -147,6 +162,12 @@ def create_video_output_stream(
     )
 
 
+# Substrings of output format names, matched with `in` so variants like webm_chunk count too
+_MP4_MOV_FORMAT_NAMES = ('mp4', 'mov')
+_MKV_WEBM_FORMAT_NAMES = ('matroska', 'webm')
+_MPEGTS_HEVC_TAGS = frozenset({'HEVC', '\x24\x00\x00\x00'})
+
+
 def _normalize_output_codec_tag(
     out_stream: VideoStream,
     output_av_container: OutputContainer,
@@ -158,8 +179,9 @@ def _normalize_output_codec_tag(
     in_codec_ctx = in_stream.codec_context
     in_codec_name = in_codec_ctx.name
 
-    is_mp4_mov_mkv = any(name in container_name for name in ('mp4', 'mov', 'matroska', 'webm'))
-    is_mp4_or_mov = any(name in container_name for name in ('mp4', 'mov'))
+    # MKV/WebM names are only scanned when the format isn't already MP4/MOV
+    is_mp4_or_mov = any(name in container_name for name in _MP4_MOV_FORMAT_NAMES)
+    is_mp4_mov_mkv = is_mp4_or_mov or any(name in container_name for name in _MKV_WEBM_FORMAT_NAMES)
 
     # Normalize MPEG-TS codec tags for MP4/MOV/MKV containers
     # Check INPUT stream's codec_tag since output may not have been populated yet
@@ -180,7 +202,7 @@ def _is_mpegts_h264_tag(codec_tag: str) -> bool:
 
 def _is_mpegts_hevc_tag(codec_tag: str) -> bool:
     """Check if codec tag is MPEG-TS style HEVC tag."""
-    return codec_tag in ('HEVC', '\x24\x00\x00\x00')
+    return codec_tag in _MPEGTS_HEVC_TAGS
 
 
 class VideoCutter:
@@ -192,7 +214,7 @@ class VideoCutter:
         video_settings: VideoSettings,
         log_level: str | None,
         initial_position: Fraction = Fraction(0),
-        initial_last_dts: int = -100_000_000,
+        initial_last_dts: int = DTS_UNKNOWN,
     ) -> None:
         self.media_container = media_container
         self.log_level = log_level
@@ -212,8 +234,11 @@ class VideoCutter:
         self.demux_iter = self.input_av_container.demux(self.in_stream)
         self.demux_saved_packet = None
 
-        # Frame buffering for fetch_frame (using heap for efficient PTS ordering)
-        self.frame_buffer: list[FrameHeapItem] = []
+        # Frame buffering for fetch_frame, a short list kept sorted by PTS. Decoders emit
+        # frames almost in PTS order, so insort mostly appends. Entries are (pts, push counter,
+        # frame) tuples with None pts as -1, so comparisons stay on ints and never reach the frame
+        self.frame_buffer: list[tuple[int, int, VideoFrame]] = []
+        self._frame_buffer_counter = itertools.count()
         self.frame_buffer_gop_dts = -1
         self.decoder = self.in_stream.codec_context
 
@@ -231,14 +256,18 @@ class VideoCutter:
             self.enc_last_pts = -1
         else:
             # Smartcut mode - set up bitstream filter for remuxing
-            self.remux_bitstream_filter = av.bitstream.BitStreamFilterContext('null', self.in_stream, self.out_stream)
+            bsf_name = 'null'
             if self.in_stream.codec_context.name == 'h264' and not is_annexb(self.in_stream.codec_context.extradata):
-                self.remux_bitstream_filter = av.bitstream.BitStreamFilterContext('h264_mp4toannexb', self.in_stream, self.out_stream)
+                bsf_name = 'h264_mp4toannexb'
             elif self.in_stream.codec_context.name == 'hevc' and not is_annexb(self.in_stream.codec_context.extradata):
-                self.remux_bitstream_filter = av.bitstream.BitStreamFilterContext('hevc_mp4toannexb', self.in_stream, self.out_stream)
+                bsf_name = 'hevc_mp4toannexb'
             # MPEG-4 Visual family: optional filters for robustness (ASF/AVI tend to need this)
             elif self.in_stream.codec_context.name in {'mpeg4', 'msmpeg4v3', 'msmpeg4v2', 'msmpeg4v1'}:
-                self.remux_bitstream_filter = av.bitstream.BitStreamFilterContext('dump_extra', self.in_stream, self.out_stream)
+                bsf_name = 'dump_extra'
+            # Even the null filter is created, it copies the codec parameters to out_stream
+            self.remux_bitstream_filter = BitStreamFilterContext(bsf_name, self.in_stream, self.out_stream)
+            # The null filter passes packets through unchanged, so remuxed packets skip it
+            self.remux_passthrough = bsf_name == 'null'
 
         # Normalize codec tags for container compatibility (must be done after bitstream filter setup)
         _normalize_output_codec_tag(self.out_stream, output_av_container, self.in_stream)
@@ -246,6 +275,10 @@ class VideoCutter:
         # Assert out_stream time_base is not None once at initialization
         assert self.out_stream.time_base is not None, "Output stream must have a time_base"
         self.out_time_base: Fraction = self.out_stream.time_base
+        # in_time_base / out_time_base as reduced ints, so remuxed timestamps are rescaled without Fractions
+        tb_ratio = self.in_time_base / self.out_time_base
+        self._tb_ratio_num = tb_ratio.numerator
+        self._tb_ratio_den = tb_ratio.denominator
 
         # Track typical frame duration for fixing missing/zero durations
         # MP4 muxer uses duration to calculate edit list boundaries, so
@@ -325,13 +358,15 @@ class VideoCutter:
             try:
                 if extradata is None:
                     raise ValueError("No extradata")
-                options_str = str(extradata.split(b'options: ')[1][:-1], 'ascii')
-                x265_params = options_str.split(' ')
-                for i, o in enumerate(x265_params):
-                    if ':' in o:
-                        x265_params[i] = o.replace(':', ',')
-                    if '=' not in o:
-                        x265_params[i] = o + '=1'
+                options_match = _X265_OPTIONS_RE.search(extradata)
+                if options_match is None:
+                    raise ValueError("No x265 options in extradata")
+                options_str = str(options_match.group(1)[:-1], 'ascii')
+                # Bare flags become flag=1, ':' in values is x265's list separator and becomes ','
+                x265_params = [
+                    o + '=1' if '=' not in o else o.replace(':', ',')
+                    for o in options_str.split(' ')
+                ]
             except Exception:
                 pass
 
@@ -362,36 +397,40 @@ class VideoCutter:
         # reading uninitialized memory when frame is None during flush)
         # See: https://github.com/PyAV-Org/PyAV/issues/397
         #      https://github.com/PyAV-Org/PyAV/discussions/933
-        if packet.dts is not None and (packet.dts < -900_000 or packet.dts > 1_000_000_000_000):
-            packet.dts = None
-
-        if packet.dts is not None:
-            if packet.dts <= self.last_dts:
-                packet.dts = self.last_dts + 1
+        # Packet attributes are property calls into PyAV, so read and write each once
+        dts = packet.dts
+        if dts is not None and (dts < -900_000 or dts > 1_000_000_000_000):
+            dts = None
+
+        last_dts = self.last_dts
+        if dts is not None:
+            if dts <= last_dts:
+                dts = last_dts + 1
             # Ensure PTS >= DTS (required by all container formats)
             # This check is separate from the monotonicity check above because
             # remux_segment may produce packets with DTS > PTS when adjusting
             # for B-frame delays after an encoded segment.
-            if packet.pts is not None and packet.pts < packet.dts:
-                packet.pts = packet.dts
-            self.last_dts = packet.dts
-        if packet.dts is None:
+            pts = packet.pts
+            if pts is not None and pts < dts:
+                packet.pts = dts
+        elif last_dts == DTS_UNKNOWN:
             # When DTS is None, use PTS as fallback (common for keyframes without B-frame reordering)
             # Ensure we don't use the sentinel value to avoid extremely negative DTS
-            pts_value = packet.pts if packet.pts is not None else 0
-            if self.last_dts < 0:
-                # First packet with None DTS, use PTS
-                packet.dts = pts_value
-            else:
-                # Subsequent packets, ensure monotonic increase
-                # Don't jump DTS up to match PTS - just increment minimally to preserve PTS >= DTS
-                packet.dts = self.last_dts + 1
-            self.last_dts = packet.dts
+            # First packet with None DTS, use PTS
+            pts = packet.pts
+            dts = pts if pts is not None else 0
+        else:
+            # Subsequent packets, ensure monotonic increase
+            # Don't jump DTS up to match PTS - just increment minimally to preserve PTS >= DTS
+            dts = last_dts + 1
+        packet.dts = dts
+        self.last_dts = dts
 
         # Fix packet duration - needed by MP4 muxer to output valid frames
         # Track typical duration from valid packets, use it when duration is missing/zero
-        if packet.duration is not None and packet.duration > 0:
-            self.typical_frame_duration = packet.duration
+        duration = packet.duration
+        if duration is not None and duration > 0:
+            self.typical_frame_duration = duration
         elif self.typical_frame_duration is not None:
             packet.duration = self.typical_frame_duration
 
@@ -432,7 +471,8 @@ class VideoCutter:
         self.enc_last_pts = -1
         self.enc_codec = enc_codec
 
-    def segment(self, cut_segment: CutSegment) -> list[Packet]:
+    def segment(self, cut_segment: CutSegment) -> Generator[Packet, None, None]:
+        # Packets are streamed to the muxer as they are produced instead of being collected per segment
         if cut_segment.require_recode:
             packets = self.recode_segment(cut_segment)
         elif self._should_hybrid_recode_cra(cut_segment):
@@ -443,18 +483,17 @@ class VideoCutter:
             self.last_remuxed_segment_gop_index = cut_segment.gop_index
             self.is_first_remuxed_segment = False
         else:
-            packets = self.flush_encoder()
-            packets.extend(self.remux_segment(cut_segment))
+            packets = itertools.chain(self.flush_encoder(), self.remux_segment(cut_segment))
             # Update tracking variables for hybrid CRA recoding
             self.last_remuxed_segment_gop_index = cut_segment.gop_index
             self.is_first_remuxed_segment = False
 
-        self.segment_start_in_output += cut_segment.end_time - cut_segment.start_time
-
+        fix_packet_timestamps = self._fix_packet_timestamps
         for packet in packets:
-            self._fix_packet_timestamps(packet)
+            fix_packet_timestamps(packet)
+            yield packet
 
-        return packets
+        self.segment_start_in_output += cut_segment.end_time - cut_segment.start_time
 
     def finish(self) -> list[Packet]:
         packets = self.flush_encoder()
@@ -465,10 +504,9 @@ class VideoCutter:
 
         return packets
 
-    def recode_segment(self, s: CutSegment) -> list[Packet]:
+    def recode_segment(self, s: CutSegment) -> Generator[Packet, None, None]:
         if not self.encoder_inited:
             self.init_encoder()
-        result_packets = []
 
         self._ensure_enc_codec()
         assert self.enc_codec is not None
@@ -481,57 +519,94 @@ class VideoCutter:
             and s.gop_index < len(self.media_container.gop_has_rasl)
             and self.media_container.gop_has_rasl[s.gop_index]
         ):
-            decoder_priming_dts = self.media_container.gop_start_times_dts[s.gop_index - 1]
+            decoder_priming_dts = int(self.media_container.gop_start_times_dts[s.gop_index - 1])
+
+        out_tb = self.out_time_base if self.codec_name != 'mpeg2video' else self.enc_codec.time_base
+        offset = Fraction(self.segment_start_in_output) / out_tb
+        offset_num, offset_den = offset.numerator, offset.denominator
+
+        # Loop invariants bound to locals, the loop runs once per recoded frame
+        encode = self.enc_codec.encode
+        scale_frame_if_needed = self._scale_frame_if_needed
+        is_mpeg2 = self.codec_name == 'mpeg2video'
+        out_time_base = self.out_time_base
+        last_pts = self.enc_last_pts
+
+        # Segment bounds and time base ratio as ints, so each frame is mapped with int math.
+        # fetch_frame's frames are always in in_time_base (see there)
+        in_tb = self.in_time_base
+        start = s.start_time / in_tb
+        end = s.end_time / in_tb
+        ratio = in_tb / out_tb
+        start_num, start_den = start.numerator, start.denominator
+        end_num, end_den = end.numerator, end.denominator
+        ratio_num, ratio_den = ratio.numerator, ratio.denominator
 
         for frame in self.fetch_frame(s.gop_start_dts, s.gop_end_dts, s.end_time, decoder_priming_dts):
-            assert frame.pts is not None, "Frame pts should not be None after decoding"
-            in_tb = frame.time_base if frame.time_base is not None else self.in_time_base
-            if frame.pts * in_tb < s.start_time:
+            pts = frame.pts
+            assert pts is not None, "Frame pts should not be None after decoding"
+
+            # pts * in_tb < start_time
+            if pts * start_den < start_num:
                 continue
-            if frame.pts * in_tb >= s.end_time:
+            # pts * in_tb >= end_time
+            if pts * end_den >= end_num:
                 break
 
-            out_tb = self.out_time_base if self.codec_name != 'mpeg2video' else self.enc_codec.time_base
+            # Same three truncating steps as int(pts - start_time / in_tb), int(pts * in_tb / out_tb)
+            # and int(pts + segment_start_in_output / out_tb)
+            pts = _rescale_ts(pts, start_den, -start_num, start_den)
+            pts = _rescale_ts(pts, ratio_num, 0, ratio_den)
+            pts = _rescale_ts(pts, offset_den, offset_num, offset_den)
 
-            frame.pts = int(frame.pts - s.start_time / in_tb)
-
-            frame.pts = int(frame.pts * in_tb / out_tb)
+            if pts <= last_pts:
+                pts = last_pts + 1
+            frame.pts = pts
             frame.time_base = out_tb
-            frame.pts = int(frame.pts + self.segment_start_in_output / out_tb)
-
-            if frame.pts <= self.enc_last_pts:
-                frame.pts = int(self.enc_last_pts + 1)
-            self.enc_last_pts = frame.pts
-
-            frame.pict_type = PictureType.NONE
-            frame = self._scale_frame_if_needed(frame)
-            result_packets.extend(self.enc_codec.encode(frame))
-
-        if self.codec_name == 'mpeg2video':
-            for p in result_packets:
-                p.pts = p.pts * p.time_base / self.out_time_base
-                p.dts = p.dts * p.time_base / self.out_time_base
-                p.time_base = self.out_time_base
-        return result_packets
-
-    def remux_segment(self, s: CutSegment) -> list[Packet]:
-        result_packets = []
+            # Kept on self every frame, the consumer may stop before the segment ends
+            self.enc_last_pts = last_pts = pts
+
+            frame.pict_type = _PICT_TYPE_NONE
+            frame = scale_frame_if_needed(frame)
+            for p in encode(frame):
+                if is_mpeg2:
+                    p.pts = p.pts * p.time_base / out_time_base
+                    p.dts = p.dts * p.time_base / out_time_base
+                    p.time_base = out_time_base
+                yield p
+
+    def remux_segment(self, s: CutSegment) -> Generator[Packet, None, None]:
         segment_start_pts = int(s.start_time / self.in_time_base)
+        scale_num, offset_num, denom = self._remux_rescale(segment_start_pts)
+        bsf_filter = self.remux_bitstream_filter.filter
+        passthrough = self.remux_passthrough
 
         for packet in self.fetch_packet(s.gop_start_dts, s.gop_end_dts):
             # Apply timing adjustments
-            segment_start_offset = self.segment_start_in_output / self.out_time_base
             pts = packet.pts if packet.pts else 0
-            packet.pts = int((pts - segment_start_pts) * self.in_time_base / self.out_time_base + segment_start_offset)
-            if packet.dts is not None:
-                packet.dts = int((packet.dts - segment_start_pts) * self.in_time_base / self.out_time_base + segment_start_offset)
+            packet.pts = _rescale_ts(pts, scale_num, offset_num, denom)
+            dts = packet.dts
+            if dts is not None:
+                packet.dts = _rescale_ts(dts, scale_num, offset_num, denom)
 
-            result_packets.extend(self.remux_bitstream_filter.filter(packet))
+            if passthrough:
+                yield packet
+            else:
+                yield from bsf_filter(packet)
 
-        result_packets.extend(self.remux_bitstream_filter.filter(None))
+        if not passthrough:
+            yield from bsf_filter(None)
+            self.remux_bitstream_filter.flush()
 
-        self.remux_bitstream_filter.flush()
-        return result_packets
+    def _remux_rescale(self, segment_start_pts: int) -> tuple[int, int, int]:
+        """
+        Integer form of int((ts - segment_start_pts) * in_time_base / out_time_base + segment_start_in_output / out_time_base),
+        as (scale_num, offset_num, denom) for _rescale_ts. Constant for a segment, so the Fraction math runs once.
+        """
+        offset = Fraction(self.segment_start_in_output) / self.out_time_base
+        scale_num = self._tb_ratio_num * offset.denominator
+        offset_num = offset.numerator * self._tb_ratio_den - segment_start_pts * scale_num
+        return scale_num, offset_num, self._tb_ratio_den * offset.denominator
 
     def _should_hybrid_recode_cra(self, s: CutSegment) -> bool:
         """
@@ -565,7 +640,7 @@ class VideoCutter:
 
         # Same reference point as remux_segment
         segment_start_pts = int(s.start_time / self.in_time_base)
-        segment_start_offset = self.segment_start_in_output / self.out_time_base
+        scale_num, offset_num, denom = self._remux_rescale(segment_start_pts)
 
         # Get leading boundary
         leading_end_dts = self.media_container.gop_leading_end_dts[s.gop_index]
@@ -577,7 +652,7 @@ class VideoCutter:
         # Decoder priming for RASL reference frames
         decoder_priming_dts = None
         if s.gop_index > 0:
-            decoder_priming_dts = self.media_container.gop_start_times_dts[s.gop_index - 1]
+            decoder_priming_dts = int(self.media_container.gop_start_times_dts[s.gop_index - 1])
 
         # Decode leading + CRA frames, collect packets for later remux
         collected_packets: list[Packet] = []
@@ -601,7 +676,7 @@ class VideoCutter:
         leading_frames = [
             f for f in all_frames
             if f.pts is not None
-            and f.pts * (f.time_base if f.time_base is not None else self.in_time_base) >= gop_start_time
+            and f.pts * self.in_time_base >= gop_start_time
             and f.pts < cra_pts
         ]
         leading_frames.sort(key=lambda f: f.pts if f.pts is not None else 0)
@@ -610,14 +685,14 @@ class VideoCutter:
         for frame in leading_frames:
             assert frame.pts is not None
             # Same formula as remux_segment
-            frame.pts = int((frame.pts - segment_start_pts) * self.in_time_base / self.out_time_base + segment_start_offset)
+            frame.pts = _rescale_ts(frame.pts, scale_num, offset_num, denom)
             frame.time_base = self.out_time_base
 
             if frame.pts <= self.enc_last_pts:
                 frame.pts = int(self.enc_last_pts + 1)
             self.enc_last_pts = frame.pts
 
-            frame.pict_type = PictureType.NONE
+            frame.pict_type = _PICT_TYPE_NONE
             result_packets.extend(self.enc_codec.encode(frame))
 
         result_packets.extend(self.flush_encoder())
@@ -634,13 +709,18 @@ class VideoCutter:
 
         for packet in remux_packets:
             pts = packet.pts if packet.pts else 0
-            packet.pts = int((pts - segment_start_pts) * self.in_time_base / self.out_time_base + segment_start_offset)
-            if packet.dts is not None:
-                packet.dts = int((packet.dts - segment_start_pts) * self.in_time_base / self.out_time_base + segment_start_offset)
-            result_packets.extend(self.remux_bitstream_filter.filter(packet))
+            packet.pts = _rescale_ts(pts, scale_num, offset_num, denom)
+            dts = packet.dts
+            if dts is not None:
+                packet.dts = _rescale_ts(dts, scale_num, offset_num, denom)
+            if self.remux_passthrough:
+                result_packets.append(packet)
+            else:
+                result_packets.extend(self.remux_bitstream_filter.filter(packet))
 
-        result_packets.extend(self.remux_bitstream_filter.filter(None))
-        self.remux_bitstream_filter.flush()
+        if not self.remux_passthrough:
+            result_packets.extend(self.remux_bitstream_filter.filter(None))
+            self.remux_bitstream_filter.flush()
 
         return result_packets
 
@@ -683,7 +763,7 @@ class VideoCutter:
     def fetch_packet(self, target_dts: int, end_dts: int) -> Generator[Packet, None, None]:
         # First, check if we have a saved packet from previous call
         if self.demux_saved_packet is not None:
-            saved_dts = self.demux_saved_packet.dts if self.demux_saved_packet.dts is not None else -100_000_000
+            saved_dts = self.demux_saved_packet.dts if self.demux_saved_packet.dts is not None else DTS_UNKNOWN
             if saved_dts >= target_dts:
                 if saved_dts <= end_dts:
                     packet = self.demux_saved_packet
@@ -696,14 +776,22 @@ class VideoCutter:
                 # Saved packet is before our target, clear it
                 self.demux_saved_packet = None
 
+        # A gap of more than 120 s before target_dts is skipped with a seek. The limit is kept
+        # in ticks so skipped packets are compared with int math instead of a Fraction product.
+        tb = self.in_time_base
+        tb_num = tb.numerator
+        gap_limit = 120 * tb.denominator
+
         for packet in self.demux_iter:
-            in_dts = packet.dts if packet.dts is not None else -100_000_000
+            in_dts = packet.dts
+            if in_dts is None:
+                in_dts = DTS_UNKNOWN
 
             # Skip packets before target_dts
-            if packet.pts is None or in_dts < target_dts:
-                diff = (target_dts - in_dts) * self.in_time_base
-                if in_dts > 0 and diff > 120:
-                    t = int(target_dts - 30 / self.in_time_base)
+            if in_dts < target_dts or packet.pts is None:
+                # (target_dts - in_dts) * in_time_base > 120
+                if in_dts > 0 and (target_dts - in_dts) * tb_num > gap_limit:
+                    t = int(target_dts - 30 / tb)
                     # print(f"Seeking to skip a gap: {float(t * tb)}")
                     self.input_av_container.seek(t, stream = self.in_stream)
                     # Clear saved packet after seek since iterator position changed
@@ -720,35 +808,61 @@ class VideoCutter:
             yield packet
 
     def fetch_frame(self, gop_start_dts: int, gop_end_dts: int, end_time: Fraction, decoder_priming_dts: int | None = None, collect_packets: list[Packet] | None = None) -> Generator[VideoFrame, None, None]:
+        """
+        Decoded frames of the GOP with pts before end_time, in pts order.
+
+        The frames come from packets demuxed from in_stream, and PyAV gives a decoded frame
+        its packet's time base. So every frame is in in_time_base, which this method and its
+        callers rely on to compare and rescale pts with integer math.
+        """
         # Check if previous iteration consumed exactly to this GOP start
         continuous = self._last_fetch_end_dts is not None and (self._last_fetch_end_dts in (gop_end_dts, gop_start_dts))
         self._last_fetch_end_dts = gop_end_dts
 
-        # Choose actual start DTS. Allow priming from previous GOP unless we're either still in the same GOP or continuing to the next one.
-        start_dts = gop_start_dts if continuous else (decoder_priming_dts if decoder_priming_dts is not None else gop_start_dts)
-
-        # Initialize or reset for new GOP boundary unless continuous
-        if self.frame_buffer_gop_dts != gop_start_dts and not continuous:
-            self.frame_buffer = []
-            self.frame_buffer_gop_dts = gop_start_dts
-            self.decoder.flush_buffers()
+        # Continuing in the same GOP or into the next one: the decoder, frame buffer and demux
+        # position are already where this call needs them, so start right at the GOP
+        if continuous:
+            start_dts = gop_start_dts
+        else:
+            # Allow priming from previous GOP
+            start_dts = decoder_priming_dts if decoder_priming_dts is not None else gop_start_dts
 
-        # If asked to start earlier than GOP, seek and clear state (skip if continuous)
-        if start_dts < gop_start_dts and not continuous:
-            try:
-                self.decoder.flush_buffers()
+            # Initialize or reset for new GOP boundary
+            if self.frame_buffer_gop_dts != gop_start_dts:
                 self.frame_buffer = []
-                self.input_av_container.seek(start_dts, stream=self.in_stream)
-                self.demux_saved_packet = None
-              # Recreate demux iterator after an explicit seek to ensure position is honored
-                self.demux_iter = self.input_av_container.demux(self.in_stream)
+                self.frame_buffer_gop_dts = gop_start_dts
+                self.decoder.flush_buffers()
 
-            except Exception:
-                pass
+            # If asked to start earlier than GOP, seek and clear state
+            if start_dts < gop_start_dts:
+                try:
+                    self.decoder.flush_buffers()
+                    self.frame_buffer = []
+                    # Seeking to INT64_MIN (AV_NOPTS_VALUE) is a no-op, an unknown DTS means the start of the file
+                    self.input_av_container.seek(start_dts if start_dts != DTS_UNKNOWN else 0, stream=self.in_stream)
+                    self.demux_saved_packet = None
+                    # Recreate demux iterator after an explicit seek to ensure position is honored
+                    self.demux_iter = self.input_av_container.demux(self.in_stream)
+
+                except Exception:
+                    pass
 
         # Process packets and yield frames when safe
         current_dts = gop_start_dts
 
+        # Loop invariants bound to locals, the loops below run per packet and per frame
+        frame_buffer = self.frame_buffer
+        decode = self.decoder.decode
+        insort = bisect.insort
+        frame_buffer_counter = self._frame_buffer_counter
+        is_hevc = self.codec_name == 'hevc'
+        # end_time in ticks of the stream time base as an int ratio, so every frame is checked
+        # against end_time with integer math
+        end = end_time / self.in_time_base
+        end_num, end_den = end.numerator, end.denominator
+        time_base_checked = False
+        BUFFERED_FRAMES_COUNT = 15 # We need this to be quite high, b/c GENPTS is on and we can't know if the pts values are real or fake
+
         for packet in self.fetch_packet(start_dts, gop_end_dts):
             current_dts = packet.dts if packet.dts is not None else current_dts
 
@@ -757,30 +871,34 @@ class VideoCutter:
             if collect_packets is not None:
                 packet_dts = packet.dts if packet.dts is not None else current_dts
                 should_collect = packet_dts >= gop_start_dts  # Skip priming packets
-                if should_collect and self.codec_name == 'hevc':
-                    nal_type = get_h265_nal_unit_type(bytes(packet))
+                if should_collect and is_hevc:
+                    # memoryview lets the NAL parser read the header in place, no payload copy
+                    nal_type = get_h265_nal_unit_type(memoryview(packet))
                     if is_leading_picture_nal_type(nal_type):
                         should_collect = False
                 if should_collect:
-                    collect_packets.append(copy_packet(packet))
+                    # Demux yields a fresh packet each time and decode() only takes a reference,
+                    # so the packet itself can be kept. Only flagged packets are copied, to drop
+                    # the discard/corrupt flags like the audio passthru does.
+                    collect_packets.append(copy_packet(packet) if packet.is_discard or packet.is_corrupt else packet)
 
             # Decode packet and add frames to buffer
-            for frame in self.decoder.decode(packet):
-                heap_item = FrameHeapItem(frame.pts, frame)
-                heapq.heappush(self.frame_buffer, heap_item)
+            for frame in decode(packet):
+                if not time_base_checked:
+                    # Reading time_base builds a Fraction, so the invariant is checked once per call
+                    assert frame.time_base in (None, self.in_time_base), f"Frame time base {frame.time_base} != stream time base {self.in_time_base}"
+                    time_base_checked = True
+                frame_pts = frame.pts
+                insort(frame_buffer, (frame_pts if frame_pts is not None else -1, next(frame_buffer_counter), frame))
 
             # Release frames that are safe (buffer_lowest_pts <= current_dts)
-            BUFFERED_FRAMES_COUNT = 15 # We need this to be quite high, b/c GENPTS is on and we can't know if the pts values are real or fake
-            while len(self.frame_buffer) > BUFFERED_FRAMES_COUNT:
-                lowest_heap_item = self.frame_buffer[0]  # Peek at heap minimum
-                frame = lowest_heap_item.frame
-                frame_pts = lowest_heap_item.pts if lowest_heap_item.pts is not None else -1
-                frame_time_base = frame.time_base if frame.time_base is not None else self.in_time_base
+            while len(frame_buffer) > BUFFERED_FRAMES_COUNT:
+                frame_pts, _, frame = frame_buffer[0]  # Peek at lowest PTS
 
                 # Only process frames that are safe to release (frame_pts <= current_dts)
                 if frame_pts <= current_dts:
-                    if frame_pts * frame_time_base < end_time:
-                        heapq.heappop(self.frame_buffer)  # Remove from heap
+                    if frame_pts * end_den < end_num:
+                        frame_buffer.pop(0)  # Remove from buffer
                         yield frame
                     else:
                         # Safe frame is beyond end_time - we're done since all frames from now would be beyond end time
@@ -790,23 +908,21 @@ class VideoCutter:
 
         # Final flush of the decoder
         try:
-            for frame in self.decoder.decode(None):
-                heap_item = FrameHeapItem(frame.pts, frame)
-                heapq.heappush(self.frame_buffer, heap_item)
+            for frame in decode(None):
+                frame_pts = frame.pts
+                insort(frame_buffer, (frame_pts if frame_pts is not None else -1, next(frame_buffer_counter), frame))
         except Exception:
             pass
 
         # Yield remaining frames within time range
-        while self.frame_buffer:
+        while frame_buffer:
             # Peek at the next frame without popping it
-            next_frame = self.frame_buffer[0]
-            frame = next_frame.frame
-            frame_time_base = frame.time_base if frame.time_base is not None else self.in_time_base
+            frame = frame_buffer[0][2]
+            frame_pts = frame.pts
 
-            if (next_frame.pts is not None and
-                next_frame.pts * frame_time_base < end_time):
+            if frame_pts is not None and frame_pts * end_den < end_num:
                 # Frame is within time range, pop and yield it
-                heapq.heappop(self.frame_buffer)
+                frame_buffer.pop(0)
                 yield frame
             else:
                 # Frame is outside time range, stop processing (leave it in buffer)